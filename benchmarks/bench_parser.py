@@ -0,0 +1,73 @@
+"""Micro-benchmark of the usage payload parser.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parser
+
+Each payload shape is parsed with a warm parser, which reuses the shape
+cached for the endpoint, and with a cold parser, which detects the shape
+first. Daily payloads are timed at several sizes so parse cost can be
+tracked per day of data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import timeit
+from typing import Any
+
+from custom_components.epb.parser import UsagePayloadParser
+
+ENDPOINT = "https://api.epb.com/web/api/v1/usage/power/permanent/compare/daily"
+SUMMARY = {"pos_kwh": 812.4, "pos_wh_est_cost": 97.49}
+
+
+def daily_payload(days: int) -> dict[str, Any]:
+    """Build a daily compare payload with ``days`` posted days."""
+    entries = [
+        {
+            "a": {"values": {"pos_kwh": 20.0 + day, "pos_wh_est_cost": 2.4}},
+            "b": {"values": {"pos_kwh": 18.0 + day, "pos_wh_est_cost": 2.2}},
+        }
+        for day in range(days)
+    ]
+    entries.extend({"a": {}, "b": {}} for _ in range(31 - days))
+    return {"data": entries, "interval_b_totals": SUMMARY}
+
+
+def payloads() -> list[tuple[str, dict[str, Any]]]:
+    """Return the labelled payloads to time."""
+    cases = [(f"daily ({days:2d} days)", daily_payload(days)) for days in (1, 15, 31)]
+    cases.append(("interval_a_totals", {"interval_a_totals": SUMMARY}))
+    cases.append(("interval_a_averages", {"interval_a_averages": SUMMARY}))
+    return cases
+
+
+def main() -> None:
+    """Time each payload shape and print the cost per parse."""
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument("--number", type=int, default=20000)
+    number = args.parse_args().number
+    logging.disable(logging.WARNING)
+
+    print(f"{'payload':<22}{'warm (us)':>12}{'cold (us)':>12}")
+    for label, payload in payloads():
+        warm = UsagePayloadParser()
+        warm.parse(ENDPOINT, payload, 2025, 1)
+        warm_time = timeit.timeit(
+            lambda: warm.parse(ENDPOINT, payload, 2025, 1), number=number
+        )
+        cold_time = timeit.timeit(
+            lambda: UsagePayloadParser().parse(ENDPOINT, payload, 2025, 1),
+            number=number,
+        )
+        print(
+            f"{label:<22}"
+            f"{warm_time / number * 1e6:>12.2f}"
+            f"{cold_time / number * 1e6:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Micro-benchmark of the local tariff engine.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_tariff
+
+Each tariff type bills years of 15-minute readings in one call, the worst
+case of pricing a full retention window, and a month of readings, the
+work done on every coordinator refresh.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from array import array
+from datetime import date, timedelta
+
+from custom_components.epb.tariff import Tariff
+
+TARIFFS = {
+    "flat": {"type": "flat", "rate": 0.11, "fixed_monthly": 10},
+    "tiered": {
+        "type": "tiered",
+        "tiers": [
+            {"up_to": 500, "rate": 0.1},
+            {"up_to": 1000, "rate": 0.12},
+            {"rate": 0.15},
+        ],
+    },
+    "time_of_use": {
+        "type": "time_of_use",
+        "default_rate": 0.1,
+        "periods": [
+            {"start": "22:00", "end": "06:00", "rate": 0.05},
+            {
+                "start": "14:00",
+                "end": "19:00",
+                "rate": 0.2,
+                "weekdays": [0, 1, 2, 3, 4],
+            },
+        ],
+    },
+}
+
+
+def readings(days: int) -> list[tuple[date, array]]:
+    """Build ``days`` days of 15-minute readings."""
+    start = date(2023, 1, 1)
+    return [
+        (
+            start + timedelta(days=day),
+            array("f", [0.1 + (slot % 12) / 100 for slot in range(96)]),
+        )
+        for day in range(days)
+    ]
+
+
+def main() -> None:
+    """Time each tariff type and print the cost per bill."""
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument("--number", type=int, default=20)
+    args.add_argument("--years", type=int, default=3)
+    parsed = args.parse_args()
+
+    cases = [
+        ("1 month", readings(31)),
+        (f"{parsed.years} years", readings(365 * parsed.years)),
+    ]
+    print(f"{'tariff':<14}{'period':<10}{'bill (ms)':>12}{'per day (us)':>14}")
+    for name, config in TARIFFS.items():
+        tariff = Tariff(config)
+        for label, days in cases:
+            elapsed = timeit.timeit(lambda: tariff.bill(days), number=parsed.number)
+            per_bill = elapsed / parsed.number
+            print(
+                f"{name:<14}{label:<10}"
+                f"{per_bill * 1e3:>12.2f}"
+                f"{per_bill / len(days) * 1e6:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,55 +7,166 @@ and cost.
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import date, timedelta
+from pathlib import Path
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (CONF_PASSWORD, CONF_SCAN_INTERVAL,
                                  CONF_USERNAME, Platform)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
-from .api import EPBApiClient
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .api import EPBApiError
+from .const import (CONF_ACCOUNT_PRIORITIES, CONF_ACCOUNTS,
+                    CONF_AGGREGATE_GROUPING, CONF_ANOMALY_THRESHOLD,
+                    CONF_INTERVAL_USAGE, CONF_LOW_PRIORITY_INTERVAL,
+                    CONF_REFRESH_DEADLINE, CONF_ROLLOVER_DAYS, CONF_TARIFF,
+                    DEFAULT_AGGREGATE_GROUPING, DEFAULT_ANOMALY_THRESHOLD,
+                    DEFAULT_INTERVAL_USAGE, DEFAULT_LOW_PRIORITY_INTERVAL,
+                    DEFAULT_REFRESH_DEADLINE, DEFAULT_ROLLOVER_DAYS,
+                    DEFAULT_SCAN_INTERVAL, DOMAIN, EXPORT_FORMATS, FORMAT_CSV,
+                    STORAGE_VERSION)
 from .coordinator import EPBUpdateCoordinator
+from .handoff import pop_handoff
+from .registry import acquire_client, release_client
+from .tariff import Tariff
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 # This integration only supports config entries
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+SERVICE_EXPORT = "export"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FILENAME = "filename"
+ATTR_FORMAT = "format"
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.date,
+        vol.Optional(ATTR_END): cv.date,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the EPB component."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_export(call: ServiceCall) -> None:
+        """Export usage history for the configured accounts."""
+        # Imported here so the module can also be run with python -m
+        # pylint: disable-next=import-outside-toplevel
+        from .export import EPBExportError, async_export_usage
+
+        path = Path(hass.config.path(call.data[ATTR_FILENAME]))
+        if not hass.config.is_allowed_path(str(path)):
+            raise HomeAssistantError(f"Cannot write to {path}, path is not allowed")
+
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        coordinators = [
+            coordinator
+            for coordinator_entry_id, coordinator in hass.data[DOMAIN].items()
+            if isinstance(coordinator, EPBUpdateCoordinator)
+            and entry_id in (None, coordinator_entry_id)
+        ]
+        if not coordinators:
+            raise HomeAssistantError("No loaded EPB config entry to export from")
+
+        end = call.data.get(ATTR_END, date.today() - timedelta(days=1))
+        for coordinator in coordinators:
+            accounts = [
+                (
+                    account["power_account"]["account_id"],
+                    account.get("premise", {}).get("gis_id"),
+                )
+                for account in coordinator.account_links
+            ]
+            try:
+                rows = await async_export_usage(
+                    coordinator.client,
+                    accounts,
+                    call.data[ATTR_START],
+                    end,
+                    path,
+                    call.data[ATTR_FORMAT],
+                )
+            except (EPBApiError, EPBExportError) as err:
+                raise HomeAssistantError(f"Export failed: {err}") from err
+            _LOGGER.info("Exported %s row(s) of EPB usage to %s", rows, path)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_EXPORT, async_export, schema=EXPORT_SCHEMA
+    )
+    async_register_websocket_commands(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up EPB from a config entry."""
-    session = async_get_clientsession(hass)
-    client = EPBApiClient(
-        entry.data[CONF_USERNAME],
-        entry.data[CONF_PASSWORD],
-        session,
-    )
+    client = acquire_client(hass, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD])
 
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    if isinstance(scan_interval, int):
+    if isinstance(scan_interval, (int, float)):
         scan_interval = timedelta(minutes=scan_interval)
 
+    tariff = None
+    if entry.options.get(CONF_TARIFF):
+        try:
+            tariff = Tariff(entry.options[CONF_TARIFF])
+        except vol.Invalid as err:
+            _LOGGER.error("Ignoring invalid tariff in the EPB options: %s", err)
+
     coordinator = EPBUpdateCoordinator(
         hass,
         client,
         update_interval=scan_interval,
+        anomaly_threshold=entry.options.get(
+            CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD
+        ),
+        aggregate_grouping=entry.options.get(
+            CONF_AGGREGATE_GROUPING, DEFAULT_AGGREGATE_GROUPING
+        ),
+        accounts=entry.options.get(CONF_ACCOUNTS),
+        account_priorities=entry.options.get(CONF_ACCOUNT_PRIORITIES),
+        low_priority_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_LOW_PRIORITY_INTERVAL, DEFAULT_LOW_PRIORITY_INTERVAL
+            )
+        ),
+        rollover_days=int(entry.options.get(CONF_ROLLOVER_DAYS, DEFAULT_ROLLOVER_DAYS)),
+        interval_usage=entry.options.get(CONF_INTERVAL_USAGE, DEFAULT_INTERVAL_USAGE),
+        tariff=tariff,
+        refresh_deadline=timedelta(
+            seconds=entry.options.get(CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE)
+        ),
+        store=Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Reuse the login and account discovery of the config flow that just
+    # created this entry, if there was one
+    if (handoff := pop_handoff(hass, entry.data[CONF_USERNAME])) is not None:
+        client.restore_session(handoff)
+        coordinator.set_account_links(handoff["account_links"])
+
+    try:
+        await coordinator.async_load_state()
+        await coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        release_client(hass, client)
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -71,11 +182,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: EPBUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        release_client(hass, coordinator.client)
 
     return bool(unload_ok)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted state of a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator: EPBUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    # Only the entry data changes otherwise, and the reauthentication flow
+    # resumes the coordinator with the new password itself
+    if dict(entry.options) != coordinator.entry_options:
+        await hass.config_entries.async_reload(entry.entry_id)
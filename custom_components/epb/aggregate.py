@@ -0,0 +1,91 @@
+"""Aggregate usage across the accounts of a config entry."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, TypedDict, cast
+
+from .api import AccountLink
+from .const import AGGREGATE_GROUPING_NONE, AGGREGATE_TOTAL
+
+
+class AggregateData(TypedDict):
+    """Type for the aggregate values of a group of accounts."""
+
+    kwh: float
+    cost: float
+    accounts: int
+
+
+def aggregate_groups(account: AccountLink, grouping: str) -> list[str]:
+    """Return the aggregate groups an account belongs to.
+
+    Args:
+        account: The account link to group
+        grouping: The premise field to group by, or ``none``
+
+    Returns:
+        The entry-wide total group, followed by the premise group if any
+    """
+    groups = [AGGREGATE_TOTAL]
+    if grouping != AGGREGATE_GROUPING_NONE:
+        premise = cast(Dict[str, Any], account.get("premise", {}))
+        value = premise.get(grouping)
+        if value:
+            groups.append(f"{grouping}:{value}")
+    return groups
+
+
+class UsageAggregator:
+    """Running totals of kwh and cost per group of accounts.
+
+    Each account's last contribution is remembered, so an account update only
+    applies the difference to the groups it belongs to instead of re-summing
+    every account in the entry.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty aggregator."""
+        self.totals: Dict[str, AggregateData] = {}
+        self._contributions: Dict[str, tuple[list[str], float, float]] = {}
+
+    def _apply(self, groups: list[str], kwh: float, cost: float, count: int) -> None:
+        """Add a delta to each of the given groups."""
+        for group in groups:
+            totals = self.totals.setdefault(
+                group, {"kwh": 0.0, "cost": 0.0, "accounts": 0}
+            )
+            totals["kwh"] += kwh
+            totals["cost"] += cost
+            totals["accounts"] += count
+
+    def update(
+        self, account_id: str, groups: list[str], kwh: float, cost: float
+    ) -> None:
+        """Set an account's contribution to its groups.
+
+        Args:
+            account_id: The EPB account ID
+            groups: The groups the account belongs to
+            kwh: The account's latest kwh value
+            cost: The account's latest cost value
+        """
+        previous = self._contributions.get(account_id)
+        if previous is not None and previous[0] == groups:
+            self._apply(groups, kwh - previous[1], cost - previous[2], 0)
+        else:
+            self.remove(account_id)
+            self._apply(groups, kwh, cost, 1)
+        self._contributions[account_id] = (groups, kwh, cost)
+
+    def remove(self, account_id: str) -> None:
+        """Remove an account's contribution from its groups."""
+        previous = self._contributions.pop(account_id, None)
+        if previous is not None:
+            self._apply(previous[0], -previous[1], -previous[2], -1)
+
+    def get(self, group: str) -> Optional[AggregateData]:
+        """Return the totals of a group, if any account belongs to it."""
+        totals = self.totals.get(group)
+        if totals is None or not totals["accounts"]:
+            return None
+        return totals
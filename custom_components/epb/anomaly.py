@@ -0,0 +1,127 @@
+"""Streaming usage anomaly detection for EPB accounts."""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import Any, Optional, TypedDict
+
+from .parser import DailyUsage
+
+
+class AnomalyData(TypedDict):
+    """Type for anomaly values exposed to sensors."""
+
+    anomaly: bool
+    anomaly_date: Optional[str]
+    anomaly_zscore: Optional[float]
+    usage_mean: Optional[float]
+    usage_stddev: Optional[float]
+
+
+class UsageAnomalyDetector:
+    """Rolling mean and variance of daily usage for a single account.
+
+    Statistics are updated with Welford's recurrence. Once ``window`` days have
+    been seen the update weight stops shrinking, which turns the running
+    statistics into exponentially weighted ones so they follow seasonal
+    changes instead of averaging over the account's whole history.
+
+    Only settled days are folded in. The most recent entry of a series is
+    still being revised by EPB, so it is held back until a later day appears.
+    """
+
+    def __init__(self, window: int, min_samples: int) -> None:
+        """Initialize an empty detector.
+
+        Args:
+            window: Number of days after which older days are decayed
+            min_samples: Number of days required before flagging anomalies
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last_date: Optional[date] = None
+        self.last_zscore: Optional[float] = None
+        self.anomaly = False
+
+    @property
+    def stddev(self) -> float:
+        """Return the current standard deviation."""
+        return math.sqrt(self.variance)
+
+    def _fold(self, day: date, kwh: float, threshold: float) -> bool:
+        """Score a settled day against the statistics, then fold it in."""
+        self.last_zscore = None
+        if self.count >= self.min_samples and self.variance > 0:
+            self.last_zscore = (kwh - self.mean) / self.stddev
+        self.anomaly = self.last_zscore is not None and self.last_zscore >= threshold
+
+        self.count += 1
+        weight = 1 / min(self.count, self.window)
+        delta = kwh - self.mean
+        self.mean += weight * delta
+        self.variance = (1 - weight) * (self.variance + weight * delta * delta)
+        self.last_date = day
+        return self.anomaly
+
+    def update(self, series: list[DailyUsage], threshold: float) -> bool:
+        """Fold newly settled days from a daily usage series.
+
+        Args:
+            series: The daily usage series, ordered by date
+            threshold: The z-score at or above which a day is anomalous
+
+        Returns:
+            True if a newly settled day was flagged as anomalous
+        """
+        flagged = False
+        start = len(series) - 1
+        while start > 0:
+            if (
+                self.last_date is not None
+                and series[start - 1]["date"] <= self.last_date
+            ):
+                break
+            start -= 1
+
+        for entry in series[start : len(series) - 1]:
+            if self._fold(entry["date"], entry["kwh"], threshold):
+                flagged = True
+        return flagged
+
+    def as_dict(self) -> AnomalyData:
+        """Return the current anomaly state."""
+        ready = self.count >= self.min_samples
+        return {
+            "anomaly": self.anomaly,
+            "anomaly_date": self.last_date.isoformat() if self.last_date else None,
+            "anomaly_zscore": (
+                round(self.last_zscore, 2) if self.last_zscore is not None else None
+            ),
+            "usage_mean": round(self.mean, 3) if ready else None,
+            "usage_stddev": round(self.stddev, 3) if ready else None,
+        }
+
+    def to_store(self) -> dict[str, Any]:
+        """Return the detector state in a form suitable for storage."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "last_date": self.last_date.isoformat() if self.last_date else None,
+            "last_zscore": self.last_zscore,
+            "anomaly": self.anomaly,
+        }
+
+    def restore(self, stored: dict[str, Any]) -> None:
+        """Restore the detector state saved by ``to_store``."""
+        self.count = int(stored.get("count", 0))
+        self.mean = float(stored.get("mean", 0.0))
+        self.variance = float(stored.get("variance", 0.0))
+        last_date = stored.get("last_date")
+        self.last_date = date.fromisoformat(last_date) if last_date else None
+        self.last_zscore = stored.get("last_zscore")
+        self.anomaly = bool(stored.get("anomaly", False))
@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from datetime import datetime
+import time
+from array import array
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import partial
 from typing import Any, Dict, Optional, TypedDict, cast
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from aiohttp import ClientError, ClientSession
 from multidict import CIMultiDict
 
+from .parser import UsagePayloadParser, UsageReport, decode_intervals, empty_report
+
 _LOGGER = logging.getLogger(__name__)
 
+# Refresh tokens this many seconds before the API says they expire
+TOKEN_EXPIRY_MARGIN = 60
+
+# Time zone of EPB's service area, used when a premise does not report one
+DEFAULT_ZONE_ID = "America/New_York"
+
+# Interval usage resolutions and the number of intervals in a day
+RESOLUTION_15_MIN = "15min"
+RESOLUTION_HOURLY = "hourly"
+INTERVAL_SLOTS = {RESOLUTION_15_MIN: 96, RESOLUTION_HOURLY: 24}
+
 
 class PowerAccount(TypedDict):
     """Type for power account data."""
@@ -39,6 +58,72 @@ class AccountLink(TypedDict):
     premise: Premise
 
 
+class AuthSession(TypedDict):
+    """Type for authenticated session state that can be handed between clients."""
+
+    token: str
+    expires_at: Optional[float]
+    account_links: list[AccountLink]
+
+
+def usage_periods(now: datetime, rollover_days: int) -> list[tuple[int, int]]:
+    """Return the (year, month) periods to fetch at a given local time.
+
+    For the first ``rollover_days`` days of a month the closing month is
+    fetched as well, because EPB keeps posting its last days after the new
+    month has started.
+
+    Args:
+        now: The current time in the premise's time zone
+        rollover_days: The number of days the closing month is still fetched
+
+    Returns:
+        The periods to fetch, oldest first
+    """
+    current = (now.year, now.month)
+    if now.day > rollover_days:
+        return [current]
+    previous = (now.replace(day=1) - timedelta(days=1)).date()
+    return [(previous.year, previous.month), current]
+
+
+def local_zone(zone_id: Optional[str]) -> ZoneInfo:
+    """Return a premise's time zone."""
+    try:
+        return ZoneInfo(zone_id or DEFAULT_ZONE_ID)
+    except (ZoneInfoNotFoundError, ValueError):
+        _LOGGER.warning("Unknown time zone %s, using %s", zone_id, DEFAULT_ZONE_ID)
+        return ZoneInfo(DEFAULT_ZONE_ID)
+
+
+def local_now(zone_id: Optional[str]) -> datetime:
+    """Return the current time in a premise's time zone."""
+    return datetime.now(local_zone(zone_id))
+
+
+def hours_in_day(day: date, zone: tzinfo) -> int:
+    """Return the length of a local day in hours.
+
+    Days with a daylight saving change have 23 or 25 hours.
+    """
+    next_day = day + timedelta(days=1)
+    start = datetime(day.year, day.month, day.day, tzinfo=zone)
+    end = datetime(next_day.year, next_day.month, next_day.day, tzinfo=zone)
+    return round(
+        (end.astimezone(timezone.utc) - start.astimezone(timezone.utc))
+        / timedelta(hours=1)
+    )
+
+
+class _InFlightRequest:
+    """A usage query being sent, and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Future[Any]) -> None:
+        """Initialize the request."""
+        self.task = task
+        self.waiters = 0
+
+
 class EPBApiError(Exception):
     """Base exception for EPB API errors."""
 
@@ -66,6 +151,13 @@ class EPBApiClient:
         self._password = password
         self._session = session
         self._token: Optional[str] = None
+        self._token_expires_at: Optional[float] = None
+        self._account_links: Optional[list[AccountLink]] = None
+        # Serialises logins, so concurrent requests share a single one
+        self._auth_lock = asyncio.Lock()
+        # Usage queries in flight, by endpoint and normalised payload
+        self._in_flight: Dict[tuple[str, str], _InFlightRequest] = {}
+        self._parser = UsagePayloadParser()
         self.base_url = "https://api.epb.com"
         _LOGGER.debug("Initializing EPB API client for user: %s", username)
 
@@ -98,19 +190,29 @@ class EPBApiClient:
                 text = await response.text()
                 _LOGGER.debug("Auth response: %s", text)
 
-                if response.status != 200:
+                if response.status in (400, 401, 403):
                     raise EPBAuthError(
                         f"Authentication failed with status {response.status}: {text}"
                     )
 
+                if response.status != 200:
+                    raise EPBApiError(
+                        f"Authentication request failed with status "
+                        f"{response.status}: {text}"
+                    )
+
                 json_response = await response.json()
-                self._token = (
-                    json_response.get("tokens", {}).get("access", {}).get("token")
-                )
+                access = json_response.get("tokens", {}).get("access", {})
+                self._token = access.get("token")
 
                 if not self._token:
                     raise EPBAuthError("No token in authentication response")
 
+                expires_in = access.get("expires_in")
+                self._token_expires_at = (
+                    time.time() + float(expires_in) if expires_in else None
+                )
+
                 _LOGGER.info("Successfully authenticated with EPB API")
 
         except ClientError as err:
@@ -119,10 +221,70 @@ class EPBApiClient:
     async def _ensure_token(self) -> None:
         """Ensure we have a valid token.
 
-        Authenticates if no token is present.
+        Authenticates if no token is present or the token is about to expire.
+        """
+        async with self._auth_lock:
+            if self._token and self._token_expires_at is not None:
+                if time.time() >= self._token_expires_at - TOKEN_EXPIRY_MARGIN:
+                    _LOGGER.debug("Token is about to expire, refreshing...")
+                    self._token = None
+
+            if not self._token:
+                await self.authenticate()
+
+    async def _renew_token(self, expired: Optional[str]) -> None:
+        """Replace a token the API reported as expired.
+
+        The token is only dropped if no other request has replaced it yet, so
+        requests that hit the same expired token share one login.
         """
-        if not self._token:
-            await self.authenticate()
+        _LOGGER.info("Token expired, refreshing...")
+        async with self._auth_lock:
+            if self._token == expired:
+                self._token = None
+        await self._ensure_token()
+
+    @property
+    def username(self) -> str:
+        """Return the EPB username this client logs in with."""
+        return self._username
+
+    def has_password(self, password: str) -> bool:
+        """Return whether the client logs in with a password."""
+        return password == self._password
+
+    def update_password(self, password: str) -> bool:
+        """Replace the password after the old one stopped working.
+
+        Returns:
+            True if the password changed and the session was cleared
+        """
+        if password == self._password:
+            return False
+        self._password = password
+        self._token = None
+        self._token_expires_at = None
+        return True
+
+    def export_session(self) -> Optional[AuthSession]:
+        """Return the authenticated session state, if any.
+
+        The state can be handed to another client with ``restore_session`` so
+        that it does not need to log in and discover accounts again.
+        """
+        if not self._token or self._account_links is None:
+            return None
+        return {
+            "token": self._token,
+            "expires_at": self._token_expires_at,
+            "account_links": self._account_links,
+        }
+
+    def restore_session(self, session: AuthSession) -> None:
+        """Adopt session state exported by another client."""
+        self._token = session["token"]
+        self._token_expires_at = session["expires_at"]
+        self._account_links = session["account_links"]
 
     async def get_account_links(self) -> list[AccountLink]:
         """Get account links from the EPB API.
@@ -140,82 +302,87 @@ class EPBApiClient:
         url = f"{self.base_url}/web/api/v1/account-links/"
         _LOGGER.debug("Fetching account links from %s", url)
 
+        headers = self._get_auth_headers()
         try:
-            async with self._session.get(
-                url, headers=self._get_auth_headers()
-            ) as response:
+            async with self._session.get(url, headers=headers) as response:
                 _LOGGER.debug("Account links response status: %s", response.status)
                 text = await response.text()
                 _LOGGER.debug("Account links response: %s", text)
 
                 if response.status == 400 and "TOKEN_EXPIRED" in text:
-                    _LOGGER.info("Token expired, refreshing...")
-                    self._token = None
-                    await self._ensure_token()
+                    await self._renew_token(headers.get("X-User-Token"))
                     return await self.get_account_links()
 
                 if response.status != 200:
                     raise EPBApiError(f"Failed to get account links: {text}")
 
                 data = await response.json()
-                return cast(list[AccountLink], data)
+                self._account_links = cast(list[AccountLink], data)
+                return self._account_links
 
         except ClientError as err:
             raise EPBApiError(
                 f"Connection error fetching account links: {err}"
             ) from err
+        except EPBApiError:
+            raise
         except Exception as err:
             raise EPBApiError(f"Error fetching account links: {err}") from err
 
-    def _extract_usage_data(self, data: Dict[str, Any]) -> Dict[str, float]:
-        """Extract usage data from API response.
+    async def _post_usage(self, url: str, payload: Dict[str, Any]) -> Any:
+        """Post a usage query and return the decoded response.
 
-        Args:
-            data: The raw API response data
+        Callers asking for a query that is already in flight share its
+        response instead of posting it again. The query is only cancelled
+        once every caller awaiting it has been cancelled.
 
-        Returns:
-            A dictionary containing kwh and cost values
+        Raises:
+            EPBAuthError: If authentication fails
+            EPBApiError: If the API rejects the query
         """
+        key = (url, json.dumps(payload, sort_keys=True, default=str))
+        request = self._in_flight.get(key)
+        if request is None:
+            task = asyncio.ensure_future(self._send_usage(url, payload))
+            task.add_done_callback(partial(self._forget_request, key))
+            request = self._in_flight[key] = _InFlightRequest(task)
+        else:
+            _LOGGER.debug("Sharing the usage query already in flight to %s", url)
+
+        request.waiters += 1
         try:
-            # First try to get data from daily format
-            if "data" in data and data["data"]:
-                # Find the last entry that has actual data
-                daily_data = data["data"]
-                latest_data = None
-
-                for entry in reversed(daily_data):
-                    if "a" in entry and "values" in entry["a"]:
-                        latest_data = entry["a"]["values"]
-                        break
-
-                if latest_data:
-                    return {
-                        "kwh": float(latest_data.get("pos_kwh", 0)),
-                        "cost": float(latest_data.get("pos_wh_est_cost", 0)),
-                    }
-
-            # If that fails or no daily data found, try the monthly format
-            if "interval_a_totals" in data:
-                totals = data["interval_a_totals"]
-                return {
-                    "kwh": float(totals.get("pos_kwh", 0)),
-                    "cost": float(totals.get("pos_wh_est_cost", 0)),
-                }
-
-            # If both attempts fail, try interval_a_averages
-            if "interval_a_averages" in data:
-                averages = data["interval_a_averages"]
-                return {
-                    "kwh": float(averages.get("pos_kwh", 0)),
-                    "cost": float(averages.get("pos_wh_est_cost", 0)),
-                }
-
-            _LOGGER.warning("No valid data format found in response: %s", data)
-            return {"kwh": 0.0, "cost": 0.0}
-
-        except (KeyError, IndexError, TypeError, ValueError) as err:
-            _LOGGER.error("Error parsing usage data: %s. Data: %s", err, data)
-            return {"kwh": 0.0, "cost": 0.0}
+            return await asyncio.shield(request.task)
+        finally:
+            request.waiters -= 1
+            if not request.waiters and not request.task.done():
+                # Forget the query now, a caller arriving while it is being
+                # cancelled must post a new one rather than join it
+                if self._in_flight.get(key) is request:
+                    del self._in_flight[key]
+                request.task.cancel()
+
+    def _forget_request(self, key: tuple[str, str], task: asyncio.Future[Any]) -> None:
+        """Stop sharing a finished usage query."""
+        request = self._in_flight.get(key)
+        if request is not None and request.task is task:
+            del self._in_flight[key]
+
+    async def _send_usage(self, url: str, payload: Dict[str, Any]) -> Any:
+        """Post a usage query, refreshing an expired token and retrying."""
+        headers = self._get_auth_headers()
+        async with self._session.post(url, json=payload, headers=headers) as response:
+            _LOGGER.debug("Usage data response status: %s", response.status)
+            text = await response.text()
+            _LOGGER.debug("Usage data response: %s", text)
+
+            if response.status == 400 and "TOKEN_EXPIRED" in text:
+                await self._renew_token(headers.get("X-User-Token"))
+                return await self._send_usage(url, payload)
+
+            if response.status != 200:
+                raise EPBApiError(f"Failed to get usage data: {text}")
+
+            return await response.json()
 
     async def get_usage_data(
         self, account_id: str, gis_id: Optional[int]
@@ -229,6 +396,37 @@ class EPBApiClient:
         Returns:
             A dictionary containing kwh and cost values
 
+        Raises:
+            EPBAuthError: If authentication fails
+            EPBApiError: If there is an API error
+        """
+        report = await self.get_usage_report(account_id, gis_id)
+        return {"kwh": report["kwh"], "cost": report["cost"]}
+
+    async def get_usage_report(
+        self,
+        account_id: str,
+        gis_id: Optional[int],
+        usage_year: Optional[int] = None,
+        usage_month: Optional[int] = None,
+        zone_id: Optional[str] = None,
+        raise_errors: bool = False,
+    ) -> UsageReport:
+        """Get usage data for an account, including the daily series.
+
+        Args:
+            account_id: The EPB account ID
+            gis_id: The optional GIS ID for the account
+            usage_year: The year to fetch, defaults to the current year
+            usage_month: The month to fetch, defaults to the current month
+            zone_id: The premise's time zone, defaults to America/New_York
+            raise_errors: Raise EPBApiError for a failed request or an
+                unreadable response instead of returning an empty report
+
+        Returns:
+            The latest kwh and cost values along with the parsed daily series
+            for the requested month
+
         Raises:
             EPBAuthError: If authentication fails
             EPBApiError: If there is an API error
@@ -238,15 +436,15 @@ class EPBApiClient:
         url = f"{self.base_url}/web/api/v1/usage/power/permanent/compare/daily"
         _LOGGER.debug("Fetching usage data from %s", url)
 
-        # Get current date
-        date = datetime.now()
-        usage_year = date.year
-        usage_month = date.month
+        if usage_year is None or usage_month is None:
+            now = local_now(zone_id)
+            usage_year = now.year
+            usage_month = now.month
 
         payload = {
             "account_number": account_id,
             "gis_id": gis_id,
-            "zone_id": "America/New_York",
+            "zone_id": zone_id or DEFAULT_ZONE_ID,
             "usage_year": usage_year,
             "usage_month": usage_month,
         }
@@ -254,31 +452,132 @@ class EPBApiClient:
         _LOGGER.debug("Usage data payload: %s", payload)
 
         try:
-            async with self._session.post(
-                url, json=payload, headers=self._get_auth_headers()
-            ) as response:
-                _LOGGER.debug("Usage data response status: %s", response.status)
-                text = await response.text()
-                _LOGGER.debug("Usage data response: %s", text)
-
-                if response.status == 400 and "TOKEN_EXPIRED" in text:
-                    _LOGGER.info("Token expired, refreshing...")
-                    self._token = None
-                    await self._ensure_token()
-                    return await self.get_usage_data(account_id, gis_id)
-
-                if response.status != 200:
-                    raise EPBApiError(f"Failed to get usage data: {text}")
-
-                data = await response.json()
-                return self._extract_usage_data(data)
+            data = await self._post_usage(url, payload)
+            return self._parser.parse(url, data, usage_year, usage_month)
 
         except ClientError as err:
             raise EPBApiError(f"Connection error fetching usage data: {err}") from err
+        except EPBAuthError:
+            raise
         except Exception as err:
+            if raise_errors:
+                if isinstance(err, EPBApiError):
+                    raise
+                raise EPBApiError(f"Error parsing usage data: {err}") from err
             _LOGGER.error(
                 "Error getting usage data for account %s: %s",
                 account_id,
                 err,
             )
-            return {"kwh": 0.0, "cost": 0.0}
+            return empty_report()
+
+    async def get_current_usage_report(
+        self,
+        account_id: str,
+        gis_id: Optional[int],
+        zone_id: Optional[str] = None,
+        rollover_days: int = 0,
+    ) -> UsageReport:
+        """Get usage data for the current month in the premise's time zone.
+
+        During the first ``rollover_days`` days of a month the closing and
+        opening months are fetched concurrently and merged into one
+        continuous daily series, so days EPB posts late for the closing month
+        are not lost when the month changes.
+
+        Args:
+            account_id: The EPB account ID
+            gis_id: The optional GIS ID for the account
+            zone_id: The premise's time zone, defaults to America/New_York
+            rollover_days: The number of days the closing month is still fetched
+
+        Returns:
+            The latest kwh and cost values, the merged daily series and the
+            current month's period comparison
+
+        Raises:
+            EPBAuthError: If authentication fails
+            EPBApiError: If there is an API error
+        """
+        periods = usage_periods(local_now(zone_id), rollover_days)
+        if len(periods) == 1:
+            year, month = periods[0]
+            return await self.get_usage_report(account_id, gis_id, year, month, zone_id)
+
+        # Log in first so concurrent requests do not each authenticate
+        await self._ensure_token()
+        closing, opening = await asyncio.gather(
+            *(
+                self.get_usage_report(account_id, gis_id, year, month, zone_id)
+                for year, month in periods
+            )
+        )
+
+        latest = opening if opening["daily"] or not closing["daily"] else closing
+        return {
+            "kwh": latest["kwh"],
+            "cost": latest["cost"],
+            "daily": closing["daily"] + opening["daily"],
+            "comparison": opening["comparison"],
+        }
+
+    async def get_interval_usage(
+        self,
+        account_id: str,
+        gis_id: Optional[int],
+        usage_date: date,
+        zone_id: Optional[str] = None,
+        resolution: str = RESOLUTION_15_MIN,
+    ) -> tuple[array, array]:
+        """Get the sub-daily usage of an account for one day.
+
+        Args:
+            account_id: The EPB account ID
+            gis_id: The optional GIS ID for the account
+            usage_date: The day to fetch, in the premise's time zone
+            zone_id: The premise's time zone, defaults to America/New_York
+            resolution: Either ``15min`` or ``hourly``
+
+        Returns:
+            The kwh and cost of each interval of the day, NaN where EPB has
+            not posted the interval yet
+
+        Raises:
+            EPBAuthError: If authentication fails
+            EPBApiError: If there is an API error
+        """
+        if resolution not in INTERVAL_SLOTS:
+            raise ValueError(f"Unsupported interval resolution: {resolution}")
+
+        # A day with a daylight saving change has an hour of intervals fewer
+        # or more
+        slots = (
+            INTERVAL_SLOTS[resolution]
+            * hours_in_day(usage_date, local_zone(zone_id))
+            // 24
+        )
+
+        await self._ensure_token()
+
+        url = f"{self.base_url}/web/api/v1/usage/power/permanent/compare/{resolution}"
+        payload = {
+            "account_number": account_id,
+            "gis_id": gis_id,
+            "zone_id": zone_id or DEFAULT_ZONE_ID,
+            "usage_year": usage_date.year,
+            "usage_month": usage_date.month,
+            "usage_day": usage_date.day,
+        }
+        _LOGGER.debug("Fetching interval usage from %s: %s", url, payload)
+
+        try:
+            data = await self._post_usage(url, payload)
+        except ClientError as err:
+            raise EPBApiError(
+                f"Connection error fetching interval usage: {err}"
+            ) from err
+
+        try:
+            return decode_intervals(data, slots)
+        except (AttributeError, TypeError, ValueError) as err:
+            raise EPBApiError(f"Error parsing interval usage: {err}") from err
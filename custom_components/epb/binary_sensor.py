@@ -0,0 +1,74 @@
+"""Support for EPB binary sensors."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import (BinarySensorDeviceClass,
+                                                    BinarySensorEntity)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import EPBUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the EPB binary sensors."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities(
+        EPBUsageAnomalySensor(coordinator, account["power_account"]["account_id"])
+        for account in coordinator.account_links
+    )
+
+
+class EPBUsageAnomalySensor(
+    CoordinatorEntity[EPBUpdateCoordinator], BinarySensorEntity
+):
+    """Binary sensor that turns on when daily usage is unusually high."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.account_id = account_id
+        self._attr_has_entity_name = True
+        self._attr_unique_id = f"epb_usage_anomaly_{account_id}"
+        self.entity_id = f"binary_sensor.epb_usage_anomaly_{account_id}"
+        self._attr_name = f"EPB Usage Anomaly {account_id}"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the latest settled day was anomalous."""
+        if not self.coordinator.data or self.account_id not in self.coordinator.data:
+            return None
+
+        return bool(self.coordinator.data[self.account_id].get("anomaly"))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        account_data = (self.coordinator.data or {}).get(self.account_id, {})
+        return {
+            "account_id": self.account_id,
+            "date": account_data.get("anomaly_date"),
+            "zscore": account_data.get("anomaly_zscore"),
+            "usage_mean": account_data.get("usage_mean"),
+            "usage_stddev": account_data.get("usage_stddev"),
+            "threshold": self.coordinator.anomaly_threshold,
+        }
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from datetime import timedelta
 from typing import Any
 
@@ -13,10 +14,21 @@ from homeassistant.const import (CONF_PASSWORD, CONF_SCAN_INTERVAL,
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import aiohttp_client, selector
+from homeassistant.helpers import selector
 
-from .api import EPBApiClient, EPBApiError, EPBAuthError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .api import AccountLink, AuthSession, EPBApiError, EPBAuthError
+from .const import (ACCOUNT_PRIORITIES, AGGREGATE_GROUPINGS,
+                    CONF_ACCOUNT_PRIORITIES, CONF_ACCOUNTS,
+                    CONF_AGGREGATE_GROUPING, CONF_ANOMALY_THRESHOLD,
+                    CONF_INTERVAL_USAGE, CONF_LOW_PRIORITY_INTERVAL,
+                    CONF_REFRESH_DEADLINE, CONF_ROLLOVER_DAYS, CONF_TARIFF,
+                    DEFAULT_AGGREGATE_GROUPING, DEFAULT_ANOMALY_THRESHOLD,
+                    DEFAULT_INTERVAL_USAGE, DEFAULT_LOW_PRIORITY_INTERVAL,
+                    DEFAULT_REFRESH_DEADLINE, DEFAULT_ROLLOVER_DAYS,
+                    DEFAULT_SCAN_INTERVAL, DOMAIN, PRIORITY_NORMAL)
+from .handoff import store_handoff
+from .registry import acquire_client, release_client
+from .tariff import Tariff
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,21 +52,37 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
-    """Validate the user input allows us to connect."""
-    session = aiohttp_client.async_get_clientsession(hass)
-    client = EPBApiClient(
-        data[CONF_USERNAME],
-        data[CONF_PASSWORD],
-        session,
-    )
+async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> AuthSession:
+    """Validate the user input allows us to connect.
 
+    Returns the authenticated session, including the discovered accounts, so
+    that entry setup can reuse it instead of logging in again.
+    """
+    client = acquire_client(hass, data[CONF_USERNAME], data[CONF_PASSWORD])
     try:
-        await client.authenticate()
+        # Logs in unless the client is shared with an entry that already has
+        await client.get_account_links()
     except EPBAuthError as err:
         raise InvalidAuth from err
     except EPBApiError as err:
         raise CannotConnect from err
+    finally:
+        release_client(hass, client)
+
+    auth_session = client.export_session()
+    if auth_session is None:
+        raise CannotConnect
+    return auth_session
+
+
+def account_label(account: AccountLink) -> str:
+    """Return a human readable label for an account link."""
+    account_id = account["power_account"]["account_id"]
+    premise: dict[str, Any] = dict(account.get("premise", {}))
+    address = premise.get("full_service_address") or premise.get("label")
+    nickname = account["power_account"].get("nickname")
+    label = " - ".join(str(part) for part in (nickname, address) if part)
+    return f"{account_id} ({label})" if label else account_id
 
 
 @config_entries.HANDLERS.register(DOMAIN)
@@ -63,6 +91,12 @@ class EPBConfigFlow(config_entries.ConfigFlow):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._user_input: dict[str, Any] = {}
+        self._session: AuthSession | None = None
+        self._reauth_entry: config_entries.ConfigEntry | None = None
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -79,7 +113,7 @@ class EPBConfigFlow(config_entries.ConfigFlow):
 
         if user_input is not None:
             try:
-                await validate_input(self.hass, user_input)
+                self._session = await validate_input(self.hass, user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -90,14 +124,112 @@ class EPBConfigFlow(config_entries.ConfigFlow):
             else:
                 await self.async_set_unique_id(user_input[CONF_USERNAME])
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=user_input[CONF_USERNAME], data=user_input
-                )
+                self._user_input = user_input
+                if len(self._session["account_links"]) > 1:
+                    return await self.async_step_accounts()
+                return self._async_create_entry()
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_accounts(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick which of the discovered accounts to add."""
+        assert self._session is not None
+        account_links = self._session["account_links"]
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_ACCOUNTS]:
+                return self._async_create_entry(user_input[CONF_ACCOUNTS])
+            errors["base"] = "no_accounts"
+
+        options = [
+            selector.SelectOptionDict(
+                value=account["power_account"]["account_id"],
+                label=account_label(account),
+            )
+            for account in account_links
+        ]
+        return self.async_show_form(
+            step_id="accounts",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ACCOUNTS,
+                        default=[option["value"] for option in options],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(options=options, multiple=True)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Handle a rejected login for an existing entry."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for a new password and resume the entry with it."""
+        assert self._reauth_entry is not None
+        entry = self._reauth_entry
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            data = {**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            try:
+                session = await validate_input(self.hass, data)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                coordinator = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+                if (
+                    entry.state is not config_entries.ConfigEntryState.LOADED
+                    or coordinator is None
+                ):
+                    store_handoff(self.hass, data[CONF_USERNAME], session)
+                    return self.async_update_reload_and_abort(entry, data=data)
+
+                # Resume the running coordinator without a reload. This is
+                # done here rather than in the update listener, which is not
+                # called when the same password is entered again, as after a
+                # temporary lockout.
+                self.hass.config_entries.async_update_entry(entry, data=data)
+                await coordinator.async_resume(data[CONF_PASSWORD], session)
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={CONF_USERNAME: entry.data[CONF_USERNAME]},
+            errors=errors,
+        )
+
+    @callback
+    def _async_create_entry(self, accounts: list[str] | None = None) -> FlowResult:
+        """Create the entry and hand the flow's session over to its setup."""
+        if self._session is not None:
+            store_handoff(self.hass, self._user_input[CONF_USERNAME], self._session)
+
+        return self.async_create_entry(
+            title=self._user_input[CONF_USERNAME],
+            data=self._user_input,
+            options={CONF_ACCOUNTS: accounts} if accounts is not None else None,
+        )
+
 
 class EPBOptionsFlow(config_entries.OptionsFlow):
     """Handle options."""
@@ -105,44 +237,210 @@ class EPBOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._options: dict[str, Any] = dict(config_entry.options)
+
+    def _account_links(self) -> list[AccountLink]:
+        """Return every account linked to the entry's login."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is None:
+            return []
+        return list(coordinator.all_account_links)
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
-        if user_input is not None:
-            # Convert minutes to timedelta
+        account_links = self._account_links()
+        errors: dict[str, str] = {}
+
+        if user_input is not None and user_input.get(CONF_ACCOUNTS) == []:
+            errors["base"] = "no_accounts"
+
+        if user_input is not None and user_input.get(CONF_TARIFF):
+            try:
+                Tariff(user_input[CONF_TARIFF])
+            except vol.Invalid as err:
+                _LOGGER.debug("Invalid tariff: %s", err)
+                errors[CONF_TARIFF] = "invalid_tariff"
+
+        if user_input is not None and not errors:
+            # Store whole minutes, timedeltas cannot be saved with the entry
             if CONF_SCAN_INTERVAL in user_input:
-                user_input[CONF_SCAN_INTERVAL] = timedelta(
-                    minutes=user_input[CONF_SCAN_INTERVAL]
-                )
-            return self.async_create_entry(title="", data=user_input)
+                user_input[CONF_SCAN_INTERVAL] = int(user_input[CONF_SCAN_INTERVAL])
+            for key in (
+                CONF_LOW_PRIORITY_INTERVAL,
+                CONF_ROLLOVER_DAYS,
+                CONF_REFRESH_DEADLINE,
+            ):
+                if key in user_input:
+                    user_input[key] = int(user_input[key])
+            # A cleared tariff is left out of the input, so drop the saved one
+            if not user_input.get(CONF_TARIFF):
+                user_input.pop(CONF_TARIFF, None)
+                self._options.pop(CONF_TARIFF, None)
+            self._options.update(user_input)
+            if self._options.get(CONF_ACCOUNTS):
+                return await self.async_step_priorities()
+            return self.async_create_entry(title="", data=self._options)
 
         # Convert timedelta to minutes for the form
         current_interval = self.config_entry.options.get(
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
-        interval_minutes = current_interval.total_seconds() / 60
-
-        options_schema = vol.Schema(
-            {
-                vol.Optional(
-                    CONF_SCAN_INTERVAL, default=int(interval_minutes)
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=1,
-                        max=60,
-                        step=1,
-                        unit_of_measurement="minutes",
-                        mode=selector.NumberSelectorMode.SLIDER,
-                    ),
+        if isinstance(current_interval, timedelta):
+            interval_minutes = current_interval.total_seconds() / 60
+        else:
+            interval_minutes = current_interval
+
+        schema: dict[Any, Any] = {
+            vol.Optional(
+                CONF_SCAN_INTERVAL, default=int(interval_minutes)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=60,
+                    step=1,
+                    unit_of_measurement="minutes",
+                    mode=selector.NumberSelectorMode.SLIDER,
                 ),
-            }
-        )
+            ),
+            vol.Optional(
+                CONF_LOW_PRIORITY_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_LOW_PRIORITY_INTERVAL, DEFAULT_LOW_PRIORITY_INTERVAL
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=15,
+                    max=1440,
+                    step=15,
+                    unit_of_measurement="minutes",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_REFRESH_DEADLINE,
+                default=self.config_entry.options.get(
+                    CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=10,
+                    max=600,
+                    step=5,
+                    unit_of_measurement="seconds",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_ROLLOVER_DAYS,
+                default=self.config_entry.options.get(
+                    CONF_ROLLOVER_DAYS, DEFAULT_ROLLOVER_DAYS
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=7,
+                    step=1,
+                    unit_of_measurement="days",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_INTERVAL_USAGE,
+                default=self.config_entry.options.get(
+                    CONF_INTERVAL_USAGE, DEFAULT_INTERVAL_USAGE
+                ),
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_ANOMALY_THRESHOLD,
+                default=self.config_entry.options.get(
+                    CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=6,
+                    step=0.5,
+                    mode=selector.NumberSelectorMode.SLIDER,
+                ),
+            ),
+            vol.Optional(
+                CONF_AGGREGATE_GROUPING,
+                default=self.config_entry.options.get(
+                    CONF_AGGREGATE_GROUPING, DEFAULT_AGGREGATE_GROUPING
+                ),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=AGGREGATE_GROUPINGS,
+                    translation_key=CONF_AGGREGATE_GROUPING,
+                ),
+            ),
+        }
+
+        schema[
+            vol.Optional(
+                CONF_TARIFF,
+                description={
+                    "suggested_value": self.config_entry.options.get(CONF_TARIFF)
+                },
+            )
+        ] = selector.ObjectSelector()
+
+        if account_links:
+            options = [
+                selector.SelectOptionDict(
+                    value=account["power_account"]["account_id"],
+                    label=account_label(account),
+                )
+                for account in account_links
+            ]
+            selected = self.config_entry.options.get(CONF_ACCOUNTS) or [
+                option["value"] for option in options
+            ]
+            schema[vol.Required(CONF_ACCOUNTS, default=selected)] = (
+                selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=options, multiple=True)
+                )
+            )
 
         return self.async_show_form(
             step_id="init",
-            data_schema=options_schema,
+            data_schema=vol.Schema(schema),
+            errors=errors,
+        )
+
+    async def async_step_priorities(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set the polling priority of each selected account."""
+        accounts: list[str] = self._options[CONF_ACCOUNTS]
+
+        if user_input is not None:
+            self._options[CONF_ACCOUNT_PRIORITIES] = {
+                account_id: user_input[account_id]
+                for account_id in accounts
+                if user_input.get(account_id, PRIORITY_NORMAL) != PRIORITY_NORMAL
+            }
+            return self.async_create_entry(title="", data=self._options)
+
+        priorities = self._options.get(CONF_ACCOUNT_PRIORITIES, {})
+        return self.async_show_form(
+            step_id="priorities",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        account_id,
+                        default=priorities.get(account_id, PRIORITY_NORMAL),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=ACCOUNT_PRIORITIES,
+                            translation_key=CONF_ACCOUNT_PRIORITIES,
+                        )
+                    )
+                    for account_id in accounts
+                }
+            ),
         )
 
 
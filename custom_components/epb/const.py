@@ -18,3 +18,80 @@ BASE_URL = "https://api.epb.com/web/api/v1"
 LOGIN_URL = f"{BASE_URL}/login/"
 ACCOUNT_LINKS_URL = f"{BASE_URL}/account-links/"
 USAGE_URL = f"{BASE_URL}/usage/power/permanent/compare/daily"
+
+# Anomaly detection
+CONF_ANOMALY_THRESHOLD = "anomaly_threshold"
+DEFAULT_ANOMALY_THRESHOLD = 3.0
+ANOMALY_WINDOW_DAYS = 90
+ANOMALY_MIN_SAMPLES = 14
+EVENT_USAGE_ANOMALY = f"{DOMAIN}_usage_anomaly"
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Aggregates
+CONF_AGGREGATE_GROUPING = "aggregate_grouping"
+AGGREGATE_GROUPING_NONE = "none"
+AGGREGATE_GROUPING_CITY = "city"
+AGGREGATE_GROUPING_ZIP_CODE = "zip_code"
+AGGREGATE_GROUPINGS = [
+    AGGREGATE_GROUPING_NONE,
+    AGGREGATE_GROUPING_CITY,
+    AGGREGATE_GROUPING_ZIP_CODE,
+]
+DEFAULT_AGGREGATE_GROUPING = AGGREGATE_GROUPING_NONE
+AGGREGATE_TOTAL = "total"
+
+# Export
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = [FORMAT_CSV, FORMAT_PARQUET]
+DEFAULT_EXPORT_CONCURRENCY = 4
+
+# Account selection and polling priorities
+CONF_ACCOUNTS = "accounts"
+CONF_ACCOUNT_PRIORITIES = "account_priorities"
+CONF_LOW_PRIORITY_INTERVAL = "low_priority_interval"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+ACCOUNT_PRIORITIES = [PRIORITY_NORMAL, PRIORITY_LOW]
+DEFAULT_LOW_PRIORITY_INTERVAL = 180  # minutes
+
+# Config flow session handoff
+DATA_HANDOFF = "handoff"
+HANDOFF_TTL = timedelta(minutes=5)
+
+# API clients shared by the entries and flows of a login
+DATA_CLIENTS = "clients"
+
+# Month rollover
+CONF_ROLLOVER_DAYS = "rollover_days"
+DEFAULT_ROLLOVER_DAYS = 2
+
+# Time budget for the account fetches of a single refresh
+CONF_REFRESH_DEADLINE = "refresh_deadline"
+DEFAULT_REFRESH_DEADLINE = 60  # seconds
+
+# Usage series websocket API
+SERIES_PERIOD_DAY = "day"
+SERIES_PERIOD_WEEK = "week"
+SERIES_PERIOD_MONTH = "month"
+SERIES_PERIODS = [SERIES_PERIOD_DAY, SERIES_PERIOD_WEEK, SERIES_PERIOD_MONTH]
+DEFAULT_SERIES_LIMIT = 366
+MAX_SERIES_LIMIT = 1000
+
+# Sub-daily interval usage
+CONF_INTERVAL_USAGE = "interval_usage"
+DEFAULT_INTERVAL_USAGE = False
+INTERVAL_BACKFILL_DAYS = 7
+INTERVAL_RETENTION_DAYS = 366
+# Hours older than this are imported as statistics even if intervals are missing
+INTERVAL_SETTLE_TIME = timedelta(hours=48)
+
+# Local tariff
+CONF_TARIFF = "tariff"
+TARIFF_FLAT = "flat"
+TARIFF_TIERED = "tiered"
+TARIFF_TIME_OF_USE = "time_of_use"
+TARIFF_TYPES = [TARIFF_FLAT, TARIFF_TIERED, TARIFF_TIME_OF_USE]
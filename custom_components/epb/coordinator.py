@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any, Dict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
 
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
                                                       UpdateFailed)
+from homeassistant.util import dt as dt_util
 
-from .api import AccountLink, EPBApiClient, EPBApiError, EPBAuthError
+from .aggregate import UsageAggregator, aggregate_groups
+from .anomaly import UsageAnomalyDetector
+from .api import (INTERVAL_SLOTS, RESOLUTION_15_MIN, AccountLink, AuthSession,
+                  EPBApiClient, EPBApiError, EPBAuthError, Premise, local_now)
+from .const import (ANOMALY_MIN_SAMPLES, ANOMALY_WINDOW_DAYS,
+                    DEFAULT_AGGREGATE_GROUPING, DEFAULT_ANOMALY_THRESHOLD,
+                    DEFAULT_LOW_PRIORITY_INTERVAL, DEFAULT_REFRESH_DEADLINE,
+                    DEFAULT_ROLLOVER_DAYS, EVENT_USAGE_ANOMALY,
+                    INTERVAL_BACKFILL_DAYS, INTERVAL_RETENTION_DAYS,
+                    PRIORITY_LOW, PRIORITY_NORMAL, STORAGE_SAVE_DELAY)
+from .forecast import UsageForecast
+from .history import UsageHistory
+from .interval import IntervalHistory
+from .parser import ComparisonData, UsageReport
+from .statistics import async_import_statistics
+from .tariff import Tariff
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +42,18 @@ class EPBUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         hass: HomeAssistant,
         client: EPBApiClient,
         update_interval: timedelta,
+        anomaly_threshold: float = DEFAULT_ANOMALY_THRESHOLD,
+        aggregate_grouping: str = DEFAULT_AGGREGATE_GROUPING,
+        accounts: Optional[list[str]] = None,
+        account_priorities: Optional[Dict[str, str]] = None,
+        low_priority_interval: timedelta = timedelta(
+            minutes=DEFAULT_LOW_PRIORITY_INTERVAL
+        ),
+        rollover_days: int = DEFAULT_ROLLOVER_DAYS,
+        interval_usage: bool = False,
+        tariff: Optional[Tariff] = None,
+        refresh_deadline: timedelta = timedelta(seconds=DEFAULT_REFRESH_DEADLINE),
+        store: Optional[Store[Dict[str, Any]]] = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -33,25 +64,432 @@ class EPBUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         )
         self.client = client
         self.account_links: list[AccountLink] = []
+        self.all_account_links: list[AccountLink] = []
+        self.accounts = accounts
+        self.account_priorities = account_priorities or {}
+        self.low_priority_interval = low_priority_interval
+        self._last_fetched: Dict[str, datetime] = {}
+        self.rollover_days = rollover_days
+        self.forecasts: Dict[str, UsageForecast] = {}
+        self.history: Dict[str, UsageHistory] = {}
+        self.interval_usage = interval_usage
+        self.intervals: Dict[str, IntervalHistory] = {}
+        self.tariff = tariff
+        self.refresh_deadline = refresh_deadline
+        self.anomaly_threshold = anomaly_threshold
+        self.anomaly_detectors: Dict[str, UsageAnomalyDetector] = {}
+        self.aggregate_grouping = aggregate_grouping
+        self.aggregator = UsageAggregator()
+        self._store = store
+        self.entry_options: Dict[str, Any] = (
+            dict(self.config_entry.options) if self.config_entry else {}
+        )
+
+    async def async_load_state(self) -> None:
+        """Restore state persisted by a previous run."""
+        if self._store is None:
+            return
+
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for account_id, state in stored.get("anomaly", {}).items():
+            self._get_anomaly_detector(account_id).restore(state)
+        for account_id, state in stored.get("history", {}).items():
+            self.history.setdefault(account_id, UsageHistory()).restore(state)
+        for account_id, state in stored.get("intervals", {}).items():
+            self._get_interval_history(account_id).restore(state)
+
+    async def async_resume(
+        self, password: str, session: Optional[AuthSession] = None
+    ) -> None:
+        """Resume polling after a successful reauthentication.
+
+        A rejected login stops the scheduled updates, so a refresh is always
+        made here, even if the password did not change. The coordinator's
+        cached state is kept.
+
+        Args:
+            password: The password that was accepted
+            session: The session the reauthentication logged in with
+        """
+        self.client.update_password(password)
+        if session is not None:
+            self.client.restore_session(session)
+        await self.async_refresh()
+
+    def set_account_links(self, account_links: list[AccountLink]) -> None:
+        """Set the account links to poll, keeping only the selected accounts."""
+        self.all_account_links = account_links
+        self.account_links = [
+            account
+            for account in account_links
+            if self.accounts is None
+            or account["power_account"]["account_id"] in self.accounts
+        ]
+
+    def _state_to_store(self) -> Dict[str, Any]:
+        """Return the state to persist between restarts."""
+        return {
+            "anomaly": {
+                account_id: detector.to_store()
+                for account_id, detector in self.anomaly_detectors.items()
+            },
+            "history": {
+                account_id: history.to_store()
+                for account_id, history in self.history.items()
+            },
+            "intervals": {
+                account_id: history.to_store()
+                for account_id, history in self.intervals.items()
+            },
+        }
+
+    def _get_anomaly_detector(self, account_id: str) -> UsageAnomalyDetector:
+        """Return the anomaly detector for an account, creating it if needed."""
+        if account_id not in self.anomaly_detectors:
+            self.anomaly_detectors[account_id] = UsageAnomalyDetector(
+                ANOMALY_WINDOW_DAYS, ANOMALY_MIN_SAMPLES
+            )
+        return self.anomaly_detectors[account_id]
+
+    def _get_interval_history(self, account_id: str) -> IntervalHistory:
+        """Return the interval history for an account, creating it if needed."""
+        if account_id not in self.intervals:
+            self.intervals[account_id] = IntervalHistory(
+                INTERVAL_SLOTS[RESOLUTION_15_MIN], INTERVAL_RETENTION_DAYS
+            )
+        return self.intervals[account_id]
+
+    def _is_due(self, account_id: str, now: datetime) -> bool:
+        """Return whether an account should be fetched in this update.
+
+        Normal priority accounts are fetched on every update. Low priority
+        accounts are only fetched once the low priority interval has passed,
+        and keep their previous values in between.
+        """
+        if self.account_priorities.get(account_id, PRIORITY_NORMAL) != PRIORITY_LOW:
+            return True
+        if not self.data or account_id not in self.data:
+            return True
+        last_fetched = self._last_fetched.get(account_id)
+        return last_fetched is None or now - last_fetched >= self.low_priority_interval
+
+    def _process_report(
+        self, account: AccountLink, report: UsageReport
+    ) -> Dict[str, Any]:
+        """Fold a fetched usage report into the account's running state."""
+        account_id = account["power_account"]["account_id"]
+        forecast = self.forecasts.setdefault(account_id, UsageForecast())
+        forecast.update(report["daily"])
+        self.history.setdefault(account_id, UsageHistory()).update(report["daily"])
+
+        detector = self._get_anomaly_detector(account_id)
+        if detector.update(report["daily"], self.anomaly_threshold):
+            self._fire_anomaly_event(account_id, detector)
+
+        self.aggregator.update(
+            account_id,
+            aggregate_groups(account, self.aggregate_grouping),
+            report["kwh"],
+            report["cost"],
+        )
+        return {
+            "kwh": report["kwh"],
+            "cost": report["cost"],
+            **forecast.as_dict(
+                local_now(account.get("premise", {}).get("zone_id")).date()
+            ),
+            **detector.as_dict(),
+            **self._comparison_values(report["comparison"]),
+        }
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from EPB."""
         try:
             if not self.account_links:
-                self.account_links = await self.client.get_account_links()
+                self.set_account_links(await self.client.get_account_links())
+
+            now = dt_util.utcnow()
+            due = [
+                account
+                for account in self.account_links
+                if account["power_account"]["account_id"]
+                and self._is_due(account["power_account"]["account_id"], now)
+            ]
+            due_ids = {account["power_account"]["account_id"] for account in due}
+            deadline = (
+                asyncio.get_running_loop().time()
+                + self.refresh_deadline.total_seconds()
+            )
+            fetched = await self._async_fetch_accounts(due, now, deadline)
+            await self._async_add_interval_values(due, fetched, deadline)
 
             data: Dict[str, Any] = {}
             for account in self.account_links:
                 account_id = account["power_account"]["account_id"]
-                gis_id = account.get("premise", {}).get("gis_id")
+                if not account_id:
+                    continue
+                if account_id in fetched:
+                    data[account_id] = fetched[account_id]
+                elif account_id not in due_ids:
+                    data[account_id] = self.data[account_id]
+                elif self.data and account_id in self.data:
+                    # The fetch missed the deadline, keep the previous values
+                    data[account_id] = {**self.data[account_id], "stale": True}
 
-                if account_id:
-                    usage_data = await self.client.get_usage_data(account_id, gis_id)
-                    data[account_id] = usage_data
+            if self._store is not None:
+                self._store.async_delay_save(self._state_to_store, STORAGE_SAVE_DELAY)
 
             return data
 
         except EPBAuthError as err:
-            raise UpdateFailed(f"Authentication failed: {err}") from err
+            # Polling stops until the user re-authenticates, so a bad password
+            # is not retried against EPB on every update
+            raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
         except EPBApiError as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+    async def _async_run_within_deadline(
+        self, tasks: Dict[str, asyncio.Task], deadline: float
+    ) -> set[str]:
+        """Wait for tasks until the deadline, cancelling those still running.
+
+        The first error raised by a task cancels the others and is raised
+        again, preferring an authentication error.
+
+        Args:
+            tasks: The tasks to wait for, by account ID
+            deadline: The event loop time at which to stop waiting
+
+        Returns:
+            The IDs of the accounts whose task finished in time
+        """
+        try:
+            done, _ = await asyncio.wait(
+                tasks.values(),
+                timeout=max(deadline - asyncio.get_running_loop().time(), 0),
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+        errors = [
+            error
+            for error in (task.exception() for task in tasks.values() if task in done)
+            if error is not None
+        ]
+        for error in errors:
+            if isinstance(error, EPBAuthError):
+                raise error
+        if errors:
+            raise errors[0]
+
+        return {account_id for account_id, task in tasks.items() if task in done}
+
+    async def _async_fetch_accounts(
+        self, accounts: list[AccountLink], now: datetime, deadline: float
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch accounts concurrently within the refresh deadline.
+
+        Fetches still running at the deadline are cancelled and left out of
+        the result, so one hung request cannot hold back the other accounts
+        or the next refresh.
+
+        Returns:
+            The values of each account fetched in time, by account ID
+        """
+        if not accounts:
+            return {}
+
+        tasks = {
+            account["power_account"]["account_id"]: asyncio.create_task(
+                self._async_update_account(account, now)
+            )
+            for account in accounts
+        }
+        done = await self._async_run_within_deadline(tasks, deadline)
+
+        for account_id in tasks.keys() - done:
+            _LOGGER.warning(
+                "Fetching account %s took longer than the %d second refresh "
+                "deadline, keeping its previous values",
+                account_id,
+                self.refresh_deadline.total_seconds(),
+            )
+        return {account_id: tasks[account_id].result() for account_id in done}
+
+    async def _async_update_account(
+        self, account: AccountLink, now: datetime
+    ) -> Dict[str, Any]:
+        """Fetch an account and fold its usage into the running state."""
+        account_id = account["power_account"]["account_id"]
+        premise = account.get("premise", {})
+        report = await self.client.get_current_usage_report(
+            account_id,
+            premise.get("gis_id"),
+            premise.get("zone_id"),
+            self.rollover_days,
+        )
+        self._last_fetched[account_id] = now
+        values = self._process_report(account, report)
+        values["stale"] = False
+        return values
+
+    async def _async_add_interval_values(
+        self,
+        accounts: list[AccountLink],
+        fetched: Dict[str, Dict[str, Any]],
+        deadline: float,
+    ) -> None:
+        """Add the interval and tariff values of the accounts fetched in time.
+
+        Intervals are only fetched once the daily values are in, with what is
+        left of the refresh deadline, so a slow backfill cannot cost an
+        account its daily values. Days fetched before the deadline are kept
+        and the rest are fetched on the next update.
+        """
+        accounts = [
+            account
+            for account in accounts
+            if account["power_account"]["account_id"] in fetched
+        ]
+        if self.interval_usage and accounts:
+            tasks = {
+                account["power_account"]["account_id"]: asyncio.create_task(
+                    self._async_fetch_intervals(
+                        account["power_account"]["account_id"],
+                        account.get("premise", {}),
+                    )
+                )
+                for account in accounts
+            }
+            done = await self._async_run_within_deadline(tasks, deadline)
+            for account_id in tasks.keys() - done:
+                _LOGGER.debug(
+                    "Interval backfill of account %s did not finish before the "
+                    "refresh deadline, continuing on the next update",
+                    account_id,
+                )
+
+        for account in accounts:
+            account_id = account["power_account"]["account_id"]
+            zone_id = account.get("premise", {}).get("zone_id")
+            values = fetched[account_id]
+            if self.interval_usage:
+                values.update(await self._async_interval_values(account_id, zone_id))
+            if self.tariff is not None:
+                values.update(self._tariff_values(self.tariff, account_id, zone_id))
+
+    async def _async_fetch_intervals(self, account_id: str, premise: Premise) -> None:
+        """Fetch the intervals posted since the last update of an account.
+
+        A failure only costs this update's intervals; the daily values of
+        the account are still updated.
+        """
+        history = self._get_interval_history(account_id)
+        now = local_now(premise.get("zone_id"))
+        try:
+            for day in history.days_to_fetch(now.date(), INTERVAL_BACKFILL_DAYS):
+                kwh, cost = await self.client.get_interval_usage(
+                    account_id, premise.get("gis_id"), day, premise.get("zone_id")
+                )
+                history.update(day, kwh, cost)
+        except EPBAuthError:
+            raise
+        except (EPBApiError, ValueError) as err:
+            _LOGGER.warning(
+                "Error fetching interval usage for account %s: %s", account_id, err
+            )
+
+    async def _async_interval_values(
+        self, account_id: str, zone_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Import an account's cached intervals and return its last hour."""
+        history = self._get_interval_history(account_id)
+        now = local_now(zone_id)
+        history.prune(now.date())
+
+        zone = now.tzinfo or dt_util.DEFAULT_TIME_ZONE
+        if "recorder" in self.hass.config.components:
+            await async_import_statistics(self.hass, account_id, history, zone)
+
+        latest = history.latest_hour(zone)
+        if latest is None:
+            return {"last_hour_kwh": None, "last_hour_cost": None, "last_hour": None}
+        start, kwh, cost = latest
+        return {
+            "last_hour_kwh": round(kwh, 3),
+            "last_hour_cost": round(cost, 2),
+            "last_hour": start.isoformat(),
+        }
+
+    def _tariff_values(
+        self, tariff: Tariff, account_id: str, zone_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Price the account's month-to-date usage with the local tariff.
+
+        Fully posted days are priced from their intervals and other days from
+        their daily total, so no extra requests are made.
+        """
+        now = local_now(zone_id)
+        today = now.date()
+        zone = now.tzinfo or dt_util.DEFAULT_TIME_ZONE
+        history = self.history.get(account_id, UsageHistory())
+        intervals = self.intervals.get(account_id)
+        days: list[tuple[date, Sequence[float]]] = []
+        for day, kwh in history.daily_kwh(today.replace(day=1), today):
+            readings = (
+                intervals.complete_kwh(day, zone) if intervals is not None else None
+            )
+            days.append((day, readings if readings is not None else [kwh]))
+
+        cost = tariff.bill(days)
+        return {
+            "tariff_cost": cost["total"],
+            "tariff_energy_charge": cost["energy_charge"],
+            "tariff_fixed_charge": cost["fixed_charge"],
+        }
+
+    @staticmethod
+    def _comparison_values(comparison: ComparisonData) -> Dict[str, Any]:
+        """Return the prior period totals and the change against them."""
+        values: Dict[str, Any] = {
+            "kwh_to_date": round(comparison["kwh_to_date"], 3),
+            "cost_to_date": round(comparison["cost_to_date"], 2),
+            "prior_kwh": comparison["prior_kwh"],
+            "prior_cost": comparison["prior_cost"],
+            "prior_kwh_to_date": comparison["prior_kwh_to_date"],
+            "prior_cost_to_date": comparison["prior_cost_to_date"],
+            "kwh_change": None,
+            "cost_change": None,
+        }
+        if comparison["prior_kwh_to_date"] is not None:
+            values["kwh_change"] = round(
+                comparison["kwh_to_date"] - comparison["prior_kwh_to_date"], 3
+            )
+        if comparison["prior_cost_to_date"] is not None:
+            values["cost_change"] = round(
+                comparison["cost_to_date"] - comparison["prior_cost_to_date"], 2
+            )
+        return values
+
+    def _fire_anomaly_event(
+        self, account_id: str, detector: UsageAnomalyDetector
+    ) -> None:
+        """Fire an event for a newly detected usage anomaly."""
+        _LOGGER.info(
+            "Unusual usage detected for account %s on %s (z-score %.2f)",
+            account_id,
+            detector.last_date,
+            detector.last_zscore,
+        )
+        self.hass.bus.async_fire(
+            EVENT_USAGE_ANOMALY,
+            {"account_id": account_id, **detector.as_dict()},
+        )
@@ -0,0 +1,339 @@
+"""Bulk export of EPB usage history to CSV or Parquet.
+
+The export can be run from Home Assistant through the ``epb.export`` service,
+or standalone::
+
+    python -m custom_components.epb.export --start 2024-01-01 --output usage.csv
+
+Credentials are read from the ``EPB_USERNAME`` and ``EPB_PASSWORD``
+environment variables when they are not given on the command line.
+
+Running the module imports the integration package, so the
+``homeassistant`` package must be installed even though no Home Assistant
+instance is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from aiohttp import ClientSession
+
+from .api import EPBApiClient, EPBApiError, EPBAuthError
+from .const import DEFAULT_EXPORT_CONCURRENCY, EXPORT_FORMATS, FORMAT_CSV
+from .parser import DailyUsage
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FIELDS = ["account_id", "date", "kwh", "cost"]
+
+
+class EPBExportError(Exception):
+    """Error raised when an export cannot be run."""
+
+
+def _months(start: date, end: date) -> Iterator[tuple[int, int]]:
+    """Yield each (year, month) from the month of start to the month of end."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _last_csv_days(path: Path) -> dict[str, date]:
+    """Return the last exported day of each account in an existing CSV file.
+
+    The file is read one row at a time so memory stays flat however much
+    history has already been exported.
+    """
+    last_days: dict[str, date] = {}
+    if not path.exists():
+        return last_days
+
+    with path.open(newline="", encoding="utf-8") as csv_file:
+        for row in csv.DictReader(csv_file):
+            day = date.fromisoformat(row["date"])
+            if day > last_days.get(row["account_id"], date.min):
+                last_days[row["account_id"]] = day
+    return last_days
+
+
+def _last_parquet_day(path: Path, account_id: str) -> Optional[date]:
+    """Return the first day of the last month exported for an account.
+
+    Parquet files cannot be appended to, so each month is written as its own
+    file. The most recent month may have been incomplete when it was written,
+    so the export resumes by rewriting it.
+    """
+    parts = sorted((path / account_id).glob("*.parquet"))
+    if not parts:
+        return None
+    year, month = (int(value) for value in parts[-1].stem.split("-"))
+    return date(year, month, 1) - timedelta(days=1)
+
+
+class _CsvSink:
+    """Append exported rows to a single CSV file."""
+
+    def __init__(self, path: Path) -> None:
+        """Open the CSV file for appending."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not path.exists() or path.stat().st_size == 0
+        self._file = path.open("a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(EXPORT_FIELDS)
+
+    def write(
+        self, account_id: str, year: int, month: int, rows: list[DailyUsage]
+    ) -> None:
+        """Write one month of rows for an account."""
+        self._writer.writerows(
+            (account_id, row["date"].isoformat(), row["kwh"], row["cost"])
+            for row in rows
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the CSV file."""
+        self._file.close()
+
+
+class _ParquetSink:
+    """Write each exported month as its own Parquet file."""
+
+    def __init__(self, path: Path) -> None:
+        """Prepare the output directory."""
+        try:
+            import pyarrow  # noqa: F401  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise EPBExportError(
+                "Parquet export requires the pyarrow package to be installed"
+            ) from err
+        self._path = path
+
+    def write(
+        self, account_id: str, year: int, month: int, rows: list[DailyUsage]
+    ) -> None:
+        """Write one month of rows for an account."""
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        table = pa.table(
+            {
+                "account_id": [account_id] * len(rows),
+                "date": [row["date"] for row in rows],
+                "kwh": [row["kwh"] for row in rows],
+                "cost": [row["cost"] for row in rows],
+            }
+        )
+        target = self._path / account_id
+        target.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, target / f"{year:04d}-{month:02d}.parquet")
+
+    def close(self) -> None:
+        """Nothing to close; each month is written as a complete file."""
+
+
+async def async_export_usage(
+    client: EPBApiClient,
+    accounts: Sequence[tuple[str, Optional[int]]],
+    start: date,
+    end: date,
+    path: Path,
+    export_format: str = FORMAT_CSV,
+    concurrency: int = DEFAULT_EXPORT_CONCURRENCY,
+) -> int:
+    """Export daily usage for a set of accounts across a date range.
+
+    Months are fetched ``concurrency`` at a time and written in order as soon
+    as each batch completes, so at most one batch is held in memory. Days that
+    were already exported by a previous run are skipped, and the current day
+    is never exported because EPB is still revising it.
+
+    An account stops at the first month that cannot be fetched, so a failed
+    month is never skipped over; the remaining accounts are still exported
+    and the failure is raised once they are done.
+
+    Args:
+        client: The API client to fetch usage with
+        accounts: The (account ID, GIS ID) pairs to export
+        start: The first day to export
+        end: The last day to export
+        path: The CSV file, or Parquet directory, to write to
+        export_format: Either ``csv`` or ``parquet``
+        concurrency: The maximum number of requests in flight
+
+    Returns:
+        The number of rows written
+
+    Raises:
+        EPBExportError: If the export cannot be run or an account failed
+        EPBAuthError: If authentication fails
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise EPBExportError(f"Unsupported export format: {export_format}")
+    if concurrency < 1:
+        raise EPBExportError("Concurrency must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    end = min(end, date.today() - timedelta(days=1))
+    # File access is blocking, so it is kept off the event loop
+    if export_format == FORMAT_CSV:
+        last_days = await loop.run_in_executor(None, _last_csv_days, path)
+        sink: _CsvSink | _ParquetSink = await loop.run_in_executor(None, _CsvSink, path)
+    else:
+        sink = _ParquetSink(path)
+        last_days = {}
+        for account_id, _ in accounts:
+            last_day = await loop.run_in_executor(
+                None, _last_parquet_day, path, account_id
+            )
+            if last_day is not None:
+                last_days[account_id] = last_day
+
+    written = 0
+    failed: list[str] = []
+    try:
+        for account_id, gis_id in accounts:
+            first_day = start
+            if account_id in last_days:
+                first_day = max(start, last_days[account_id] + timedelta(days=1))
+            if first_day > end:
+                _LOGGER.debug("Account %s is already exported", account_id)
+                continue
+
+            months = list(_months(first_day, end))
+            for batch_start in range(0, len(months), concurrency):
+                batch = months[batch_start : batch_start + concurrency]
+                reports = await asyncio.gather(
+                    *(
+                        client.get_usage_report(
+                            account_id, gis_id, year, month, raise_errors=True
+                        )
+                        for year, month in batch
+                    ),
+                    return_exceptions=True,
+                )
+                error: Optional[BaseException] = None
+                for (year, month), report in zip(batch, reports):
+                    if isinstance(report, BaseException):
+                        error = report
+                        break
+                    rows = [
+                        row
+                        for row in report["daily"]
+                        if first_day <= row["date"] <= end
+                    ]
+                    if rows:
+                        await loop.run_in_executor(
+                            None, sink.write, account_id, year, month, rows
+                        )
+                        written += len(rows)
+                if error is not None:
+                    if isinstance(error, EPBAuthError) or not isinstance(
+                        error, EPBApiError
+                    ):
+                        raise error
+                    # Later months are not written, so the next export
+                    # resumes from the month that failed
+                    _LOGGER.error(
+                        "Stopped exporting account %s at %04d-%02d: %s",
+                        account_id,
+                        year,
+                        month,
+                        error,
+                    )
+                    failed.append(f"{account_id} ({year:04d}-{month:02d}: {error})")
+                    break
+                _LOGGER.debug(
+                    "Exported %s month(s) for account %s", len(batch), account_id
+                )
+    finally:
+        await loop.run_in_executor(None, sink.close)
+
+    if failed:
+        raise EPBExportError(
+            f"Exported {written} row(s) but stopped early for account(s) "
+            + ", ".join(failed)
+        )
+    return written
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.epb.export",
+        description="Export EPB daily usage history to CSV or Parquet.",
+    )
+    parser.add_argument("--username", default=os.environ.get("EPB_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("EPB_PASSWORD"))
+    parser.add_argument("--start", required=True, type=date.fromisoformat)
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=1),
+    )
+    parser.add_argument("--output", required=True, type=Path)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=FORMAT_CSV)
+    parser.add_argument(
+        "--account",
+        action="append",
+        dest="accounts",
+        help="Account ID to export; may be repeated (default: all accounts)",
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_EXPORT_CONCURRENCY)
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    """Run the export described by the command line arguments."""
+    async with ClientSession() as session:
+        client = EPBApiClient(args.username, args.password, session)
+        accounts: list[tuple[str, Optional[int]]] = []
+        for link in await client.get_account_links():
+            account_id = link["power_account"]["account_id"]
+            if args.accounts and account_id not in args.accounts:
+                continue
+            premise: dict[str, Any] = dict(link.get("premise", {}))
+            accounts.append((account_id, premise.get("gis_id")))
+
+        return await async_export_usage(
+            client,
+            accounts,
+            args.start,
+            args.end,
+            args.output,
+            args.format,
+            args.concurrency,
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the export from the command line."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    if not args.username or not args.password:
+        print("EPB username and password are required", file=sys.stderr)
+        return 2
+
+    try:
+        rows = asyncio.run(_async_main(args))
+    except (EPBApiError, EPBExportError) as err:
+        print(f"Export failed: {err}", file=sys.stderr)
+        return 1
+    print(f"Exported {rows} row(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Month-end usage forecasting for EPB accounts."""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date
+from typing import Optional, TypedDict
+
+from .parser import DailyUsage
+
+
+class ForecastData(TypedDict):
+    """Type for forecast values exposed to sensors."""
+
+    daily_run_rate_kwh: Optional[float]
+    daily_run_rate_cost: Optional[float]
+    projected_kwh: Optional[float]
+    projected_cost: Optional[float]
+
+
+class UsageForecast:
+    """Running month-to-date aggregates for a single account.
+
+    EPB posts usage late and keeps revising recent days after newer days have
+    appeared. Rather than summing the whole series on every refresh, the value
+    folded in for each day of the month is kept, and only days whose value
+    changed since the previous update move the running totals, so a refresh
+    does one comparison per day and arithmetic only for the revised days.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty forecast."""
+        self.year: Optional[int] = None
+        self.month: Optional[int] = None
+        self.kwh_total = 0.0
+        self.cost_total = 0.0
+        self.last_date: Optional[date] = None
+        self._days: dict[date, tuple[float, float]] = {}
+
+    @property
+    def days(self) -> int:
+        """Return the number of days folded in for the month."""
+        return len(self._days)
+
+    def _reset(self, year: int, month: int) -> None:
+        """Start accumulating a new month."""
+        self.year = year
+        self.month = month
+        self.kwh_total = 0.0
+        self.cost_total = 0.0
+        self.last_date = None
+        self._days = {}
+
+    def _fold(self, entry: DailyUsage) -> None:
+        """Fold a single day into the running totals."""
+        day = entry["date"]
+        if (day.year, day.month) != (self.year, self.month):
+            if self.year is not None and self.month is not None:
+                if (day.year, day.month) < (self.year, self.month):
+                    return
+            self._reset(day.year, day.month)
+
+        values = (entry["kwh"], entry["cost"])
+        previous = self._days.get(day)
+        if previous == values:
+            return
+        if previous is not None:
+            # The day was revised; swap the old values for the new ones
+            self.kwh_total -= previous[0]
+            self.cost_total -= previous[1]
+
+        self.kwh_total += values[0]
+        self.cost_total += values[1]
+        self._days[day] = values
+        if self.last_date is None or day > self.last_date:
+            self.last_date = day
+
+    def update(self, series: list[DailyUsage]) -> None:
+        """Fold new and revised days of a daily usage series into the totals.
+
+        Args:
+            series: The daily usage series, ordered by date
+        """
+        for entry in series:
+            self._fold(entry)
+
+    @property
+    def days_in_month(self) -> Optional[int]:
+        """Return the number of days in the month being forecast."""
+        if self.year is None or self.month is None:
+            return None
+        return calendar.monthrange(self.year, self.month)[1]
+
+    def as_dict(self, today: Optional[date] = None) -> ForecastData:
+        """Return the current run rates and month-end projections.
+
+        Args:
+            today: The current day in the premise's time zone. A day on or
+                after it is still being posted, so it is left out of the run
+                rate instead of counting as a full day of usage.
+        """
+        days_in_month = self.days_in_month
+        days = self.days
+        kwh_total = self.kwh_total
+        cost_total = self.cost_total
+        if today is not None and self.last_date is not None and self.last_date >= today:
+            last_kwh, last_cost = self._days[self.last_date]
+            days -= 1
+            kwh_total -= last_kwh
+            cost_total -= last_cost
+
+        if not days or days_in_month is None:
+            return {
+                "daily_run_rate_kwh": None,
+                "daily_run_rate_cost": None,
+                "projected_kwh": None,
+                "projected_cost": None,
+            }
+
+        kwh_rate = kwh_total / days
+        cost_rate = cost_total / days
+        return {
+            "daily_run_rate_kwh": round(kwh_rate, 3),
+            "daily_run_rate_cost": round(cost_rate, 2),
+            "projected_kwh": round(kwh_rate * days_in_month, 3),
+            "projected_cost": round(cost_rate * days_in_month, 2),
+        }
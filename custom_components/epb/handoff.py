@@ -0,0 +1,44 @@
+"""Hand the config flow's authenticated session over to entry setup."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .api import AuthSession
+from .const import DATA_HANDOFF, DOMAIN, HANDOFF_TTL
+
+
+def store_handoff(hass: HomeAssistant, username: str, session: AuthSession) -> None:
+    """Keep a flow's session so the entry it creates can skip logging in.
+
+    Args:
+        hass: The Home Assistant instance
+        username: The EPB username the session belongs to
+        session: The authenticated session state
+    """
+    handoffs: Dict[str, tuple[AuthSession, float]] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_HANDOFF, {})
+    handoffs[username] = (session, time.monotonic() + HANDOFF_TTL.total_seconds())
+
+
+def pop_handoff(hass: HomeAssistant, username: str) -> Optional[AuthSession]:
+    """Take a session handed off by a config flow, if it is still fresh.
+
+    Args:
+        hass: The Home Assistant instance
+        username: The EPB username to look up
+
+    Returns:
+        The session state, or None if there is none or it has gone stale
+    """
+    handoffs: Dict[str, tuple[AuthSession, float]] = hass.data.get(DOMAIN, {}).get(
+        DATA_HANDOFF, {}
+    )
+    handoff = handoffs.pop(username, None)
+    if handoff is None or time.monotonic() > handoff[1]:
+        return None
+    return handoff[0]
@@ -0,0 +1,117 @@
+"""Cached daily usage history for EPB accounts."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from typing import Any, Optional, TypedDict
+
+from .const import SERIES_PERIOD_DAY, SERIES_PERIOD_MONTH, SERIES_PERIOD_WEEK
+from .parser import DailyUsage
+
+
+class SeriesPoint(TypedDict):
+    """Type for a point of a usage series served to the frontend."""
+
+    date: str
+    kwh: float
+    cost: float
+
+
+def _period_start(day: date, period: str) -> date:
+    """Return the first day of the period a day falls in."""
+    if period == SERIES_PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == SERIES_PERIOD_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+class UsageHistory:
+    """Daily usage of a single account, kept in date order.
+
+    Each refresh re-reads the whole current month, so days already held are
+    overwritten in place and only new days are inserted. Range queries
+    bisect the sorted dates instead of scanning the full history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self._days: list[date] = []
+        self._values: dict[date, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of days held."""
+        return len(self._days)
+
+    def update(self, series: list[DailyUsage]) -> None:
+        """Merge a daily usage series into the history."""
+        for entry in series:
+            day = entry["date"]
+            if day not in self._values:
+                insort(self._days, day)
+            self._values[day] = (entry["kwh"], entry["cost"])
+
+    def daily_kwh(self, start: date, end: date) -> list[tuple[date, float]]:
+        """Return the usage of each day held between two days."""
+        low = bisect_left(self._days, start)
+        high = bisect_right(self._days, end)
+        return [(day, self._values[day][0]) for day in self._days[low:high]]
+
+    def query(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        period: str = SERIES_PERIOD_DAY,
+    ) -> list[SeriesPoint]:
+        """Return the usage between two days, summed per period.
+
+        Args:
+            start: The first day to include, defaults to the first day held
+            end: The last day to include, defaults to the last day held
+            period: Whether to return days, weeks or months
+
+        Returns:
+            One point per period that has usage, ordered by date
+        """
+        low = 0 if start is None else bisect_left(self._days, start)
+        high = len(self._days) if end is None else bisect_right(self._days, end)
+
+        points: list[SeriesPoint] = []
+        bucket: Optional[date] = None
+        kwh = cost = 0.0
+        for day in self._days[low:high]:
+            day_start = _period_start(day, period)
+            if day_start != bucket:
+                if bucket is not None:
+                    points.append(_point(bucket, kwh, cost))
+                bucket, kwh, cost = day_start, 0.0, 0.0
+            day_kwh, day_cost = self._values[day]
+            kwh += day_kwh
+            cost += day_cost
+        if bucket is not None:
+            points.append(_point(bucket, kwh, cost))
+        return points
+
+    def to_store(self) -> dict[str, Any]:
+        """Return the history in a form suitable for storage."""
+        return {
+            "days": [day.isoformat() for day in self._days],
+            "kwh": [self._values[day][0] for day in self._days],
+            "cost": [self._values[day][1] for day in self._days],
+        }
+
+    def restore(self, stored: dict[str, Any]) -> None:
+        """Restore the history saved by ``to_store``."""
+        self._values = {
+            date.fromisoformat(day): (float(kwh), float(cost))
+            for day, kwh, cost in zip(
+                stored.get("days", []), stored.get("kwh", []), stored.get("cost", [])
+            )
+        }
+        self._days = sorted(self._values)
+
+
+def _point(day: date, kwh: float, cost: float) -> SeriesPoint:
+    """Build a series point."""
+    return {"date": day.isoformat(), "kwh": round(kwh, 3), "cost": round(cost, 2)}
@@ -0,0 +1,217 @@
+"""Sub-daily interval usage history for EPB accounts."""
+
+from __future__ import annotations
+
+import base64
+import math
+from array import array
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Any, Iterator, Optional
+
+
+def _encode(values: array) -> str:
+    """Encode an array of floats for storage."""
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(encoded: str) -> array:
+    """Decode an array of floats saved by ``_encode``."""
+    values = array("f")
+    values.frombytes(base64.b64decode(encoded))
+    return values
+
+
+def _utc_midnight(day: date, zone: tzinfo) -> datetime:
+    """Return the start of a local day in UTC."""
+    return datetime(day.year, day.month, day.day, tzinfo=zone).astimezone(timezone.utc)
+
+
+class IntervalHistory:
+    """Interval usage of a single account, stored as one pair of arrays per day.
+
+    Each day holds the kwh and cost of every interval in single precision
+    ``array`` objects, with NaN marking intervals EPB has not posted yet. At
+    15-minute resolution a year is about 35k intervals, or under 300 kB per
+    account, and days past the retention window are dropped.
+    """
+
+    def __init__(self, slots_per_day: int, retention_days: int) -> None:
+        """Initialize an empty history.
+
+        Args:
+            slots_per_day: The number of intervals in a 24-hour day
+            retention_days: The number of days to keep
+        """
+        self.slots_per_day = slots_per_day
+        self.slots_per_hour = slots_per_day // 24
+        self.retention_days = retention_days
+        self._kwh: dict[date, array] = {}
+        self._cost: dict[date, array] = {}
+
+    def __len__(self) -> int:
+        """Return the number of days held."""
+        return len(self._kwh)
+
+    def day(self, day: date) -> Optional[tuple[array, array]]:
+        """Return the kwh and cost arrays of a day."""
+        if day not in self._kwh:
+            return None
+        return self._kwh[day], self._cost[day]
+
+    def is_complete(self, day: date) -> bool:
+        """Return whether every interval of a day has been posted."""
+        values = self._kwh.get(day)
+        return values is not None and not any(math.isnan(value) for value in values)
+
+    def complete_kwh(self, day: date, zone: tzinfo) -> Optional[array]:
+        """Return the kwh of a fully posted day by local time of day.
+
+        The result always has ``slots_per_day`` slots, one per interval of a
+        regular day's clock. On a daylight saving change the skipped hour's
+        slots are zero and the repeated hour's intervals are added together.
+        """
+        if not self.is_complete(day):
+            return None
+        kwh = self._kwh[day]
+        if len(kwh) == self.slots_per_day:
+            return kwh
+
+        by_clock = array("f", [0.0]) * self.slots_per_day
+        minutes_per_slot = 24 * 60 // self.slots_per_day
+        midnight = _utc_midnight(day, zone)
+        for index, value in enumerate(kwh):
+            local = (midnight + timedelta(minutes=index * minutes_per_slot)).astimezone(
+                zone
+            )
+            by_clock[(local.hour * 60 + local.minute) // minutes_per_slot] += value
+        return by_clock
+
+    def days_to_fetch(self, today: date, backfill_days: int) -> list[date]:
+        """Return the days that may still have intervals to fetch.
+
+        An empty history is backfilled ``backfill_days`` days. Afterwards
+        only the days from the latest day held onwards are fetched, skipping
+        days that are already complete, so each refresh usually asks for
+        today and, until EPB has posted all of it, yesterday.
+        """
+        start = today - timedelta(days=backfill_days - 1)
+        if self._kwh:
+            start = max(start, min(max(self._kwh), today - timedelta(days=1)))
+        days = []
+        while start <= today:
+            if not self.is_complete(start):
+                days.append(start)
+            start += timedelta(days=1)
+        return days
+
+    def update(self, day: date, kwh: array, cost: array) -> None:
+        """Merge the posted intervals of a day into the history.
+
+        A day has one interval per slot of each of its hours, so days with
+        a daylight saving change have an hour's worth of slots fewer or more.
+        """
+        hours, extra = divmod(len(kwh), self.slots_per_hour)
+        if len(cost) != len(kwh) or extra or not 23 <= hours <= 25:
+            raise ValueError(f"Unexpected number of intervals for {day}: {len(kwh)}")
+        if day not in self._kwh or len(self._kwh[day]) != len(kwh):
+            self._kwh[day] = kwh
+            self._cost[day] = cost
+            return
+
+        stored_kwh = self._kwh[day]
+        stored_cost = self._cost[day]
+        for index, value in enumerate(kwh):
+            if not math.isnan(value):
+                stored_kwh[index] = value
+                stored_cost[index] = cost[index]
+
+    def prune(self, today: date) -> None:
+        """Drop the days that have fallen out of the retention window."""
+        cutoff = today - timedelta(days=self.retention_days)
+        for day in [day for day in self._kwh if day <= cutoff]:
+            del self._kwh[day]
+            del self._cost[day]
+
+    def _hours(self, day: date, zone: tzinfo) -> Iterator[tuple[datetime, int, int]]:
+        """Yield the start, first slot and number of posted slots of each hour.
+
+        Hours are counted from local midnight in UTC, so the repeated hour of
+        a daylight saving change gets its own start and the skipped hour
+        none.
+        """
+        kwh = self._kwh[day]
+        midnight = _utc_midnight(day, zone)
+        for hour in range(len(kwh) // self.slots_per_hour):
+            first = hour * self.slots_per_hour
+            posted = sum(
+                not math.isnan(value)
+                for value in kwh[first : first + self.slots_per_hour]
+            )
+            yield (midnight + timedelta(hours=hour)).astimezone(zone), first, posted
+
+    def _hour_total(self, day: date, first: int) -> tuple[float, float]:
+        """Return the kwh and cost of the posted intervals of an hour."""
+        last = first + self.slots_per_hour
+        kwh = self._kwh[day][first:last]
+        cost = self._cost[day][first:last]
+        # Round away the noise of the single precision storage
+        return (
+            round(sum(value for value in kwh if not math.isnan(value)), 4),
+            round(sum(value for value in cost if not math.isnan(value)), 4),
+        )
+
+    def hours_after(
+        self, after: Optional[datetime], zone: tzinfo, settled_before: datetime
+    ) -> list[tuple[datetime, float, float]]:
+        """Return the hourly totals that follow an hour already reported.
+
+        Hours are returned in order up to the first hour that is still
+        missing intervals. An hour that started before ``settled_before``
+        will not be revised any more, so it is returned with the intervals
+        that were posted rather than holding back every later hour.
+
+        Args:
+            after: The start of the last hour already reported, if any
+            zone: The premise's time zone
+            settled_before: The time before which hours are final
+
+        Returns:
+            The start, kwh and cost of each hour
+        """
+        hours: list[tuple[datetime, float, float]] = []
+        for day in sorted(self._kwh):
+            if after is not None and day < after.astimezone(zone).date():
+                continue
+            for start, first, posted in self._hours(day, zone):
+                if after is not None and start <= after:
+                    continue
+                if posted < self.slots_per_hour and start >= settled_before:
+                    return hours
+                hours.append((start, *self._hour_total(day, first)))
+        return hours
+
+    def latest_hour(self, zone: tzinfo) -> Optional[tuple[datetime, float, float]]:
+        """Return the start, kwh and cost of the latest fully posted hour."""
+        for day in sorted(self._kwh, reverse=True):
+            for start, first, posted in reversed(list(self._hours(day, zone))):
+                if posted == self.slots_per_hour:
+                    return (start, *self._hour_total(day, first))
+        return None
+
+    def to_store(self) -> dict[str, Any]:
+        """Return the history in a form suitable for storage."""
+        return {
+            "slots_per_day": self.slots_per_day,
+            "days": {
+                day.isoformat(): [_encode(self._kwh[day]), _encode(self._cost[day])]
+                for day in sorted(self._kwh)
+            },
+        }
+
+    def restore(self, stored: dict[str, Any]) -> None:
+        """Restore the history saved by ``to_store``."""
+        if stored.get("slots_per_day") != self.slots_per_day:
+            return
+        for day, (kwh, cost) in stored.get("days", {}).items():
+            self._kwh[date.fromisoformat(day)] = _decode(kwh)
+            self._cost[date.fromisoformat(day)] = _decode(cost)
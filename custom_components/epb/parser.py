@@ -0,0 +1,309 @@
+"""Parser for EPB usage payloads."""
+
+from __future__ import annotations
+
+import calendar
+import logging
+import math
+from array import array
+from datetime import date
+from typing import Any, Callable, Dict, Optional, TypedDict, cast
+
+_LOGGER = logging.getLogger(__name__)
+
+SHAPE_DAILY = "daily"
+SHAPE_TOTALS = "interval_a_totals"
+SHAPE_AVERAGES = "interval_a_averages"
+SHAPE_UNKNOWN = "unknown"
+
+
+class DailyUsage(TypedDict):
+    """Type for a single day of parsed usage data."""
+
+    date: date
+    kwh: float
+    cost: float
+
+
+class ComparisonData(TypedDict):
+    """Type for current and prior period totals from a compare response."""
+
+    kwh_to_date: float
+    cost_to_date: float
+    prior_kwh: Optional[float]
+    prior_cost: Optional[float]
+    prior_kwh_to_date: Optional[float]
+    prior_cost_to_date: Optional[float]
+
+
+class UsageReport(TypedDict):
+    """Type for parsed usage data for a billing period."""
+
+    kwh: float
+    cost: float
+    daily: list[DailyUsage]
+    comparison: ComparisonData
+
+
+def empty_comparison() -> ComparisonData:
+    """Return comparison totals for a response without usable data."""
+    return {
+        "kwh_to_date": 0.0,
+        "cost_to_date": 0.0,
+        "prior_kwh": None,
+        "prior_cost": None,
+        "prior_kwh_to_date": None,
+        "prior_cost_to_date": None,
+    }
+
+
+def empty_report() -> UsageReport:
+    """Return a usage report for a response without usable data."""
+    return {"kwh": 0.0, "cost": 0.0, "daily": [], "comparison": empty_comparison()}
+
+
+def _latest_values(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the current values of the last posted day of a daily payload."""
+    entries = data.get("data")
+    if not entries or not isinstance(entries, list):
+        return None
+    for entry in reversed(entries):
+        current = (entry or {}).get("a") or {}
+        if "values" in current:
+            return cast(Dict[str, Any], current["values"])
+    return None
+
+
+def detect_shape(data: Dict[str, Any]) -> str:
+    """Return the shape of a usage payload.
+
+    Shapes are checked in order of preference: the daily series, then the
+    period totals, then the period averages.
+    """
+    if _latest_values(data):
+        return SHAPE_DAILY
+    if SHAPE_TOTALS in data:
+        return SHAPE_TOTALS
+    if SHAPE_AVERAGES in data:
+        return SHAPE_AVERAGES
+    return SHAPE_UNKNOWN
+
+
+def _decode_series(
+    data: Dict[str, Any], year: int, month: int
+) -> tuple[Optional[Dict[str, Any]], list[DailyUsage], ComparisonData]:
+    """Read the latest values, daily series and comparison in a single pass.
+
+    The daily response holds one entry per day of the requested month, so
+    the position of an entry gives its day of the month. Each entry carries
+    the requested period under ``a`` and the comparison period under ``b``.
+    Days that have not been posted yet carry no values and are left out of
+    the series.
+    """
+    series: list[DailyUsage] = []
+    comparison = empty_comparison()
+    entries = data.get("data")
+    if not entries or not isinstance(entries, list):
+        return None, series, comparison
+
+    days_in_month = calendar.monthrange(year, month)[1]
+    kwh_to_date = cost_to_date = 0.0
+    prior_kwh = prior_cost = 0.0
+    prior_kwh_to_date = prior_cost_to_date = 0.0
+    has_prior = False
+    latest: Optional[Dict[str, Any]] = None
+
+    for index, entry in enumerate(entries):
+        if not entry:
+            continue
+        current = entry.get("a") or {}
+        values = current.get("values")
+        if "values" in current:
+            latest = values
+        if index >= days_in_month:
+            continue
+
+        prior_values = (entry.get("b") or {}).get("values")
+        if prior_values:
+            has_prior = True
+            day_prior_kwh = float(prior_values.get("pos_kwh", 0))
+            day_prior_cost = float(prior_values.get("pos_wh_est_cost", 0))
+            prior_kwh += day_prior_kwh
+            prior_cost += day_prior_cost
+            if values:
+                prior_kwh_to_date += day_prior_kwh
+                prior_cost_to_date += day_prior_cost
+
+        if not values:
+            continue
+        kwh = float(values.get("pos_kwh", 0))
+        cost = float(values.get("pos_wh_est_cost", 0))
+        kwh_to_date += kwh
+        cost_to_date += cost
+        series.append({"date": date(year, month, index + 1), "kwh": kwh, "cost": cost})
+
+    comparison["kwh_to_date"] = kwh_to_date
+    comparison["cost_to_date"] = cost_to_date
+    if has_prior:
+        # Prefer the API's own totals for the whole comparison period
+        totals = data.get("interval_b_totals") or {}
+        comparison["prior_kwh"] = float(totals.get("pos_kwh", prior_kwh))
+        comparison["prior_cost"] = float(totals.get("pos_wh_est_cost", prior_cost))
+        comparison["prior_kwh_to_date"] = prior_kwh_to_date
+        comparison["prior_cost_to_date"] = prior_cost_to_date
+
+    return latest, series, comparison
+
+
+def _decode_daily(data: Dict[str, Any], year: int, month: int) -> Optional[UsageReport]:
+    """Decode a daily compare payload.
+
+    Returns:
+        The decoded report, or None if no day has been posted yet
+    """
+    latest, series, comparison = _decode_series(data, year, month)
+    if not latest:
+        return None
+    return {
+        "kwh": float(latest.get("pos_kwh", 0)),
+        "cost": float(latest.get("pos_wh_est_cost", 0)),
+        "daily": series,
+        "comparison": comparison,
+    }
+
+
+def _summary_decoder(
+    key: str, *preferred: str
+) -> Callable[[Dict[str, Any], int, int], Optional[UsageReport]]:
+    """Return a decoder for a payload whose latest values are period summaries.
+
+    The decoder declines payloads that also carry one of the ``preferred``
+    summaries, so a cached shape never shadows a better one.
+    """
+
+    def decode(data: Dict[str, Any], year: int, month: int) -> Optional[UsageReport]:
+        summary = data.get(key)
+        if summary is None or any(other in data for other in preferred):
+            return None
+        latest, series, comparison = _decode_series(data, year, month)
+        if latest:
+            # A posted day takes precedence over the summary values
+            return None
+        return {
+            "kwh": float(summary.get("pos_kwh", 0)),
+            "cost": float(summary.get("pos_wh_est_cost", 0)),
+            "daily": series,
+            "comparison": comparison,
+        }
+
+    return decode
+
+
+DECODERS: Dict[str, Callable[[Dict[str, Any], int, int], Optional[UsageReport]]] = {
+    SHAPE_DAILY: _decode_daily,
+    SHAPE_TOTALS: _summary_decoder(SHAPE_TOTALS),
+    SHAPE_AVERAGES: _summary_decoder(SHAPE_AVERAGES, SHAPE_TOTALS),
+}
+
+
+def decode_intervals(data: Dict[str, Any], slots: int) -> tuple[array, array]:
+    """Decode an interval payload into per-slot kwh and cost arrays.
+
+    The interval response holds one entry per interval of the requested day,
+    so the position of an entry gives its slot. Intervals that have not been
+    posted yet are left as NaN.
+
+    Args:
+        data: The raw API response data
+        slots: The number of intervals in the day, which is an hour's worth
+            fewer or more on a daylight saving change
+
+    Returns:
+        The kwh and cost of each interval as single precision arrays
+    """
+    kwh = array("f", [math.nan]) * slots
+    cost = array("f", [math.nan]) * slots
+    entries = data.get("data")
+    if not entries or not isinstance(entries, list):
+        return kwh, cost
+
+    for index, entry in enumerate(entries[:slots]):
+        values = ((entry or {}).get("a") or {}).get("values")
+        if not values:
+            continue
+        kwh[index] = float(values.get("pos_kwh", 0))
+        cost[index] = float(values.get("pos_wh_est_cost", 0))
+    return kwh, cost
+
+
+class UsagePayloadParser:
+    """Parse usage payloads with a decoder chosen per endpoint.
+
+    Each endpoint keeps returning the same payload shape, so the shape is
+    detected once and its decoder is reused for later payloads. A decoder
+    that does not recognise a payload returns None, and only then is the
+    shape detected again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser with no known shapes."""
+        self._shapes: Dict[str, str] = {}
+
+    def shape(self, endpoint: str) -> Optional[str]:
+        """Return the payload shape last seen for an endpoint."""
+        return self._shapes.get(endpoint)
+
+    def parse(
+        self, endpoint: str, data: Dict[str, Any], year: int, month: int
+    ) -> UsageReport:
+        """Parse a usage payload.
+
+        Args:
+            endpoint: The endpoint the payload came from
+            data: The raw API response data
+            year: The year that was requested
+            month: The month that was requested
+
+        Returns:
+            The latest kwh and cost values, the daily series and the period
+            comparison. A payload that cannot be parsed yields zeros.
+        """
+        try:
+            cached = self._shapes.get(endpoint)
+            if cached is not None and cached != SHAPE_UNKNOWN:
+                report = DECODERS[cached](data, year, month)
+                if report is not None:
+                    return report
+
+            shape = detect_shape(data)
+            if shape != cached:
+                if shape == SHAPE_UNKNOWN:
+                    _LOGGER.warning(
+                        "No valid data format found in response with keys: %s",
+                        sorted(data),
+                    )
+                else:
+                    _LOGGER.debug(
+                        "Usage payload shape for %s is %s (was %s)",
+                        endpoint,
+                        shape,
+                        cached,
+                    )
+                self._shapes[endpoint] = shape
+
+            if shape == SHAPE_UNKNOWN:
+                # Keep whatever daily history the payload does carry
+                _, series, comparison = _decode_series(data, year, month)
+                return {
+                    "kwh": 0.0,
+                    "cost": 0.0,
+                    "daily": series,
+                    "comparison": comparison,
+                }
+            return DECODERS[shape](data, year, month) or empty_report()
+
+        except (AttributeError, KeyError, IndexError, TypeError, ValueError) as err:
+            _LOGGER.error("Error parsing usage data: %s", err)
+            _LOGGER.debug("Unparseable usage data: %s", data)
+            self._shapes.pop(endpoint, None)
+            return empty_report()
@@ -0,0 +1,77 @@
+"""Share EPB API clients between the users of the same login."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+
+from .api import EPBApiClient
+from .const import DATA_CLIENTS, DOMAIN
+from .handoff import store_handoff
+
+
+def acquire_client(hass: HomeAssistant, username: str, password: str) -> EPBApiClient:
+    """Return the client for a login, creating it if it is not in use.
+
+    Entries and flows that use the same credentials share one client, and
+    with it the token, the discovered accounts and the cached payload
+    shapes, so they do not each log in. Every client acquired must be
+    handed back with ``release_client``.
+
+    A caller with a different password than the shared client, such as a
+    flow checking a new password, gets a client of its own so that a wrong
+    password cannot clear the session of the running entry.
+
+    Args:
+        hass: The Home Assistant instance
+        username: The EPB username
+        password: The EPB password
+
+    Returns:
+        The API client to use
+    """
+    clients: Dict[str, tuple[EPBApiClient, int]] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_CLIENTS, {})
+    session = aiohttp_client.async_get_clientsession(hass)
+
+    if username not in clients:
+        client = EPBApiClient(username, password, session)
+        clients[username] = (client, 1)
+        return client
+
+    client, refs = clients[username]
+    if not client.has_password(password):
+        return EPBApiClient(username, password, session)
+    clients[username] = (client, refs + 1)
+    return client
+
+
+def release_client(hass: HomeAssistant, client: EPBApiClient) -> None:
+    """Hand back a client taken with ``acquire_client``.
+
+    When its last user releases the shared client, its session is handed
+    off, so an entry that is being reloaded can pick it up without logging
+    in again.
+
+    Args:
+        hass: The Home Assistant instance
+        client: The client to release
+    """
+    clients: Dict[str, tuple[EPBApiClient, int]] = hass.data.get(DOMAIN, {}).get(
+        DATA_CLIENTS, {}
+    )
+    shared = clients.get(client.username)
+    if shared is None or shared[0] is not client:
+        return
+
+    refs = shared[1] - 1
+    if refs > 0:
+        clients[client.username] = (client, refs)
+        return
+
+    del clients[client.username]
+    if (session := client.export_session()) is not None:
+        store_handoff(hass, client.username, session)
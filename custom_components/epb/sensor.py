@@ -3,17 +3,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, cast
 
-from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity,
-                                             SensorStateClass)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
 
-from .const import DOMAIN
+from .aggregate import AggregateData, aggregate_groups
+from .const import AGGREGATE_TOTAL, DOMAIN
 from .coordinator import EPBUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,13 +32,36 @@ async def async_setup_entry(
     """Set up the EPB sensor."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
+    entities: list[SensorEntity] = []
+    groups: list[str] = []
     for account in coordinator.account_links:
         account_id = account["power_account"]["account_id"]
         entities.extend(
             [
                 EPBEnergySensor(coordinator, account_id),
                 EPBCostSensor(coordinator, account_id),
+                EPBProjectedEnergySensor(coordinator, account_id),
+                EPBProjectedCostSensor(coordinator, account_id),
+                EPBDailyRunRateSensor(coordinator, account_id),
+                EPBPriorEnergySensor(coordinator, account_id),
+                EPBPriorCostSensor(coordinator, account_id),
+                EPBEnergyChangeSensor(coordinator, account_id),
+                EPBCostChangeSensor(coordinator, account_id),
+            ]
+        )
+        if coordinator.interval_usage:
+            entities.append(EPBLastHourEnergySensor(coordinator, account_id))
+        if coordinator.tariff is not None:
+            entities.append(EPBTariffCostSensor(coordinator, account_id))
+        for group in aggregate_groups(account, coordinator.aggregate_grouping):
+            if group not in groups:
+                groups.append(group)
+
+    for group in groups:
+        entities.extend(
+            [
+                EPBAggregateEnergySensor(coordinator, config_entry.entry_id, group),
+                EPBAggregateCostSensor(coordinator, config_entry.entry_id, group),
             ]
         )
 
@@ -56,10 +84,20 @@ class EPBSensorBase(CoordinatorEntity[EPBUpdateCoordinator], SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
+        account_data = (self.coordinator.data or {}).get(self.account_id, {})
         return {
             "account_id": self.account_id,
+            "stale": account_data.get("stale", False),
         }
 
+    def _account_value(self, key: str) -> float | None:
+        """Return a value from this account's coordinator data."""
+        if not self.coordinator.data or self.account_id not in self.coordinator.data:
+            return None
+
+        value = self.coordinator.data[self.account_id].get(key)
+        return float(value) if value is not None else None
+
 
 class EPBEnergySensor(EPBSensorBase):
     """Sensor for EPB energy usage."""
@@ -119,3 +157,356 @@ class EPBCostSensor(EPBSensorBase):
 
         cost = self.coordinator.data[self.account_id].get("cost")
         return float(cost) if cost is not None else None
+
+
+class EPBProjectedEnergySensor(EPBSensorBase):
+    """Sensor for the projected month-end EPB energy usage."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_projected_energy_{account_id}"
+        self.entity_id = f"sensor.epb_projected_energy_{account_id}"
+        self._attr_name = f"EPB Projected Energy {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("projected_kwh")
+
+
+class EPBProjectedCostSensor(EPBSensorBase):
+    """Sensor for the projected month-end EPB energy cost."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_native_unit_of_measurement = "$"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_projected_cost_{account_id}"
+        self.entity_id = f"sensor.epb_projected_cost_{account_id}"
+        self._attr_name = f"EPB Projected Cost {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("projected_cost")
+
+
+class EPBDailyRunRateSensor(EPBSensorBase):
+    """Sensor for the average daily EPB energy usage this month."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "kWh/d"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_daily_run_rate_{account_id}"
+        self.entity_id = f"sensor.epb_daily_run_rate_{account_id}"
+        self._attr_name = f"EPB Daily Run Rate {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("daily_run_rate_kwh")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "daily_run_rate_cost": self._account_value("daily_run_rate_cost"),
+        }
+
+
+class EPBPriorEnergySensor(EPBSensorBase):
+    """Sensor for the EPB energy usage of the comparison period."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_prior_energy_{account_id}"
+        self.entity_id = f"sensor.epb_prior_energy_{account_id}"
+        self._attr_name = f"EPB Prior Period Energy {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("prior_kwh")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "to_date": self._account_value("prior_kwh_to_date"),
+        }
+
+
+class EPBPriorCostSensor(EPBSensorBase):
+    """Sensor for the EPB energy cost of the comparison period."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_native_unit_of_measurement = "$"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_prior_cost_{account_id}"
+        self.entity_id = f"sensor.epb_prior_cost_{account_id}"
+        self._attr_name = f"EPB Prior Period Cost {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("prior_cost")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "to_date": self._account_value("prior_cost_to_date"),
+        }
+
+
+class EPBEnergyChangeSensor(EPBSensorBase):
+    """Sensor for the change in EPB energy usage against the prior period."""
+
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_energy_change_{account_id}"
+        self.entity_id = f"sensor.epb_energy_change_{account_id}"
+        self._attr_name = f"EPB Energy Change {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("kwh_change")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "to_date": self._account_value("kwh_to_date"),
+            "prior_to_date": self._account_value("prior_kwh_to_date"),
+        }
+
+
+class EPBCostChangeSensor(EPBSensorBase):
+    """Sensor for the change in EPB energy cost against the prior period."""
+
+    _attr_native_unit_of_measurement = "$"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_cost_change_{account_id}"
+        self.entity_id = f"sensor.epb_cost_change_{account_id}"
+        self._attr_name = f"EPB Cost Change {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("cost_change")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "to_date": self._account_value("cost_to_date"),
+            "prior_to_date": self._account_value("prior_cost_to_date"),
+        }
+
+
+class EPBLastHourEnergySensor(EPBSensorBase):
+    """Sensor for the EPB energy usage of the latest fully posted hour."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_last_hour_energy_{account_id}"
+        self.entity_id = f"sensor.epb_last_hour_energy_{account_id}"
+        self._attr_name = f"EPB Last Hour Energy {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("last_hour_kwh")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        last_hour = None
+        if self.coordinator.data and self.account_id in self.coordinator.data:
+            last_hour = self.coordinator.data[self.account_id].get("last_hour")
+        return {
+            **super().extra_state_attributes,
+            "cost": self._account_value("last_hour_cost"),
+            "hour_start": last_hour,
+        }
+
+
+class EPBTariffCostSensor(EPBSensorBase):
+    """Sensor for the month-to-date cost priced with the local tariff."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_native_unit_of_measurement = "$"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        account_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, account_id)
+        self._attr_unique_id = f"epb_tariff_cost_{account_id}"
+        self.entity_id = f"sensor.epb_tariff_cost_{account_id}"
+        self._attr_name = f"EPB Tariff Cost {account_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self._account_value("tariff_cost")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            **super().extra_state_attributes,
+            "energy_charge": self._account_value("tariff_energy_charge"),
+            "fixed_charge": self._account_value("tariff_fixed_charge"),
+        }
+
+
+class EPBAggregateSensorBase(CoordinatorEntity[EPBUpdateCoordinator], SensorEntity):
+    """Base class for sensors that sum a group of EPB accounts."""
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        entry_id: str,
+        group: str,
+        kind: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.group = group
+        self._attr_has_entity_name = True
+        if group == AGGREGATE_TOTAL:
+            self._attr_unique_id = f"epb_total_{kind}_{entry_id}"
+            self.entity_id = f"sensor.epb_total_{kind}"
+            self._attr_name = f"EPB Total {kind.title()}"
+        else:
+            grouping, value = group.split(":", 1)
+            self._attr_unique_id = f"epb_{grouping}_{kind}_{entry_id}_{slugify(value)}"
+            self.entity_id = f"sensor.epb_{slugify(value)}_{kind}"
+            self._attr_name = f"EPB {value} {kind.title()}"
+
+    @property
+    def _totals(self) -> AggregateData | None:
+        """Return the running totals for this sensor's group."""
+        return cast("AggregateData | None", self.coordinator.aggregator.get(self.group))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        totals = self._totals
+        return {
+            "group": self.group,
+            "accounts": totals["accounts"] if totals else 0,
+        }
+
+
+class EPBAggregateEnergySensor(EPBAggregateSensorBase):
+    """Sensor for the summed energy usage of a group of EPB accounts."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        entry_id: str,
+        group: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry_id, group, "energy")
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        totals = self._totals
+        return round(totals["kwh"], 3) if totals else None
+
+
+class EPBAggregateCostSensor(EPBAggregateSensorBase):
+    """Sensor for the summed energy cost of a group of EPB accounts."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = "$"
+
+    def __init__(
+        self,
+        coordinator: EPBUpdateCoordinator,
+        entry_id: str,
+        group: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry_id, group, "cost")
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        totals = self._totals
+        return round(totals["cost"], 2) if totals else None
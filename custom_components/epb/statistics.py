@@ -0,0 +1,93 @@
+"""Hourly long-term statistics imported from EPB interval usage."""
+
+from __future__ import annotations
+
+import logging
+from datetime import tzinfo
+from typing import Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (StatisticData,
+                                                      StatisticMetaData)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics, get_last_statistics)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN, INTERVAL_SETTLE_TIME
+from .interval import IntervalHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_ids(account_id: str) -> tuple[str, str]:
+    """Return the energy and cost statistic IDs of an account."""
+    object_id = slugify(account_id)
+    return f"{DOMAIN}:energy_{object_id}", f"{DOMAIN}:cost_{object_id}"
+
+
+async def async_import_statistics(
+    hass: HomeAssistant, account_id: str, history: IntervalHistory, zone: tzinfo
+) -> int:
+    """Import the hours that are not in the recorder yet as statistics.
+
+    The last imported hour and running sum are read back from the recorder,
+    so each call only adds the hours that have been posted since.
+
+    Returns:
+        The number of hours imported
+    """
+    energy_id, cost_id = statistic_ids(account_id)
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, energy_id, True, {"sum"}
+    )
+    after = None
+    energy_sum = cost_sum = 0.0
+    if last.get(energy_id):
+        row = last[energy_id][0]
+        after = dt_util.utc_from_timestamp(row["start"])
+        energy_sum = row["sum"] or 0.0
+        last_cost = await get_instance(hass).async_add_executor_job(
+            get_last_statistics, hass, 1, cost_id, True, {"sum"}
+        )
+        if last_cost.get(cost_id):
+            cost_sum = last_cost[cost_id][0]["sum"] or 0.0
+
+    hours = history.hours_after(after, zone, dt_util.utcnow() - INTERVAL_SETTLE_TIME)
+    if not hours:
+        return 0
+
+    energy: list[StatisticData] = []
+    cost: list[StatisticData] = []
+    for start, kwh, hour_cost in hours:
+        energy_sum += kwh
+        cost_sum += hour_cost
+        energy.append({"start": start, "state": kwh, "sum": energy_sum})
+        cost.append({"start": start, "state": hour_cost, "sum": cost_sum})
+
+    async_add_external_statistics(
+        hass,
+        _metadata(energy_id, account_id, "Energy", UnitOfEnergy.KILO_WATT_HOUR),
+        energy,
+    )
+    async_add_external_statistics(
+        hass, _metadata(cost_id, account_id, "Cost", None), cost
+    )
+    _LOGGER.debug("Imported %s hour(s) of statistics for %s", len(hours), account_id)
+    return len(hours)
+
+
+def _metadata(
+    statistic_id: str, account_id: str, kind: str, unit: Optional[str]
+) -> StatisticMetaData:
+    """Return the metadata of an imported statistic."""
+    return {
+        "has_mean": False,
+        "has_sum": True,
+        "name": f"EPB {kind} {account_id}",
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
@@ -0,0 +1,219 @@
+"""Local tariff model for computing EPB energy cost."""
+
+from __future__ import annotations
+
+import math
+import operator
+from array import array
+from datetime import date, time
+from typing import Any, Iterable, Sequence, TypedDict
+
+import voluptuous as vol
+
+from .const import TARIFF_FLAT, TARIFF_TIERED, TARIFF_TIME_OF_USE, TARIFF_TYPES
+
+# Interval resolutions a rate vector is precomputed for: daily totals,
+# hourly and 15-minute readings
+SLOT_COUNTS = (1, 24, 96)
+
+
+def _time(value: Any) -> time:
+    """Validate a HH:MM time of day."""
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid time of day: {value}") from err
+
+
+def _rate(value: Any) -> float:
+    """Validate a non-negative rate or charge."""
+    return float(vol.All(vol.Coerce(float), vol.Range(min=0))(value))
+
+
+def _ascending_tiers(tiers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Validate that tier limits increase and only the last tier is open."""
+    limits = [tier.get("up_to") for tier in tiers]
+    if any(limit is None for limit in limits[:-1]):
+        raise vol.Invalid("Only the last tier can be without an up_to limit")
+    bounded = [limit for limit in limits if limit is not None]
+    if bounded != sorted(set(bounded)):
+        raise vol.Invalid("Tier up_to limits must increase")
+    return tiers
+
+
+def _rates_for_type(config: dict[str, Any]) -> dict[str, Any]:
+    """Validate that the rates required by the tariff type are present."""
+    required = {
+        TARIFF_FLAT: "rate",
+        TARIFF_TIERED: "tiers",
+        TARIFF_TIME_OF_USE: "periods",
+    }[config["type"]]
+    if required not in config:
+        raise vol.Invalid(f"A {config['type']} tariff needs {required}")
+    return config
+
+
+TIER_SCHEMA = vol.Schema(
+    {
+        vol.Optional("up_to"): vol.Any(
+            None, vol.All(vol.Coerce(float), vol.Range(min=0))
+        ),
+        vol.Required("rate"): _rate,
+    }
+)
+
+PERIOD_SCHEMA = vol.Schema(
+    {
+        vol.Required("start"): _time,
+        vol.Required("end"): _time,
+        vol.Required("rate"): _rate,
+        vol.Optional("weekdays", default=list(range(7))): [
+            vol.All(int, vol.Range(min=0, max=6))
+        ],
+    }
+)
+
+TARIFF_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("type"): vol.In(TARIFF_TYPES),
+            vol.Optional("rate"): _rate,
+            vol.Optional("tiers"): vol.All(
+                [TIER_SCHEMA], vol.Length(min=1), _ascending_tiers
+            ),
+            vol.Optional("periods"): vol.All([PERIOD_SCHEMA], vol.Length(min=1)),
+            vol.Optional("default_rate", default=0.0): _rate,
+            vol.Optional("fixed_monthly", default=0.0): _rate,
+            vol.Optional("fixed_daily", default=0.0): _rate,
+        }
+    ),
+    _rates_for_type,
+)
+
+
+class TariffCost(TypedDict):
+    """Type for the cost of a billing period under a tariff."""
+
+    kwh: float
+    energy_charge: float
+    fixed_charge: float
+    total: float
+
+
+class Tariff:
+    """A tariff that prices usage locally instead of EPB's cost estimate.
+
+    Flat and tiered tariffs only depend on the total usage of a period. A
+    time-of-use tariff prices each interval by the time of day it falls in,
+    so a rate vector is precomputed for every weekday at each resolution and
+    a day of readings is priced as one dot product against its vector. Days
+    that only have a daily total are priced at the default rate.
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize the tariff from a configuration.
+
+        Raises:
+            vol.Invalid: If the configuration is not a valid tariff
+        """
+        config = TARIFF_SCHEMA(config)
+        self.type: str = config["type"]
+        self.rate: float = config.get("rate", 0.0)
+        self.tiers: list[tuple[float, float]] = [
+            (
+                math.inf if tier.get("up_to") is None else tier["up_to"],
+                tier["rate"],
+            )
+            for tier in config.get("tiers", [])
+        ]
+        self.fixed_monthly: float = config["fixed_monthly"]
+        self.fixed_daily: float = config["fixed_daily"]
+        self._rates: dict[tuple[int, int], array] = {}
+        if self.type == TARIFF_TIME_OF_USE:
+            for weekday in range(7):
+                for slots in SLOT_COUNTS:
+                    self._rates[weekday, slots] = _rate_vector(
+                        config["periods"], config["default_rate"], weekday, slots
+                    )
+
+    def _tiered_charge(self, kwh: float) -> float:
+        """Return the charge for a period's usage under the tier blocks."""
+        charge = 0.0
+        floor = 0.0
+        for up_to, rate in self.tiers:
+            if kwh <= floor:
+                break
+            charge += (min(kwh, up_to) - floor) * rate
+            floor = up_to
+        return charge
+
+    def bill(self, days: Iterable[tuple[date, Sequence[float]]]) -> TariffCost:
+        """Return the cost of a billing period.
+
+        Args:
+            days: Each day of the period with its readings, either a single
+                daily total or one reading per interval. Intervals that have
+                not been posted yet are NaN and are left out.
+
+        Returns:
+            The usage, energy and fixed charges, and total for the period
+        """
+        total_kwh = 0.0
+        energy_charge = 0.0
+        day_count = 0
+        for day, readings in days:
+            day_count += 1
+            posted: Sequence[float] = readings
+            if any(map(math.isnan, readings)):
+                posted = [value if value == value else 0.0 for value in readings]
+            total_kwh += math.fsum(posted)
+            if self.type == TARIFF_TIME_OF_USE:
+                rates = self._rates.get((day.weekday(), len(posted)))
+                if rates is None:
+                    raise ValueError(f"Unsupported number of intervals: {len(posted)}")
+                energy_charge += math.fsum(map(operator.mul, posted, rates))
+
+        if self.type == TARIFF_FLAT:
+            energy_charge = total_kwh * self.rate
+        elif self.type == TARIFF_TIERED:
+            energy_charge = self._tiered_charge(total_kwh)
+
+        fixed_charge = (
+            self.fixed_monthly + self.fixed_daily * day_count if day_count else 0.0
+        )
+        return {
+            "kwh": round(total_kwh, 3),
+            "energy_charge": round(energy_charge, 2),
+            "fixed_charge": round(fixed_charge, 2),
+            "total": round(energy_charge + fixed_charge, 2),
+        }
+
+
+def _rate_vector(
+    periods: list[dict[str, Any]], default_rate: float, weekday: int, slots: int
+) -> array:
+    """Return the rate of each interval of a weekday.
+
+    An interval takes the rate of the last period it starts in, so later
+    periods override earlier ones. A period whose end is not after its start
+    wraps past midnight. With a single slot the day is priced at the default
+    rate, as the time of day of its usage is unknown.
+    """
+    rates = array("d", [default_rate]) * slots
+    if slots == 1:
+        return rates
+    minutes_per_slot = 24 * 60 // slots
+    for period in periods:
+        if weekday not in period["weekdays"]:
+            continue
+        start = period["start"].hour * 60 + period["start"].minute
+        end = period["end"].hour * 60 + period["end"].minute
+        for slot in range(slots):
+            minute = slot * minutes_per_slot
+            if start < end:
+                inside = start <= minute < end
+            else:
+                inside = minute >= start or minute < end
+            if inside:
+                rates[slot] = period["rate"]
+    return rates
@@ -0,0 +1,86 @@
+"""Websocket API serving cached EPB usage series."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (DEFAULT_SERIES_LIMIT, DOMAIN, MAX_SERIES_LIMIT,
+                    SERIES_PERIOD_DAY, SERIES_PERIODS)
+from .coordinator import EPBUpdateCoordinator
+from .history import UsageHistory
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the EPB websocket commands."""
+    websocket_api.async_register_command(hass, ws_usage_series)
+
+
+def _find_history(
+    hass: HomeAssistant, account_id: str, entry_id: Optional[str]
+) -> Optional[UsageHistory]:
+    """Return the cached history of an account from a loaded entry."""
+    for coordinator_entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if not isinstance(coordinator, EPBUpdateCoordinator):
+            continue
+        if entry_id not in (None, coordinator_entry_id):
+            continue
+        if account_id in coordinator.history:
+            return coordinator.history[account_id]
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "epb/usage_series",
+        vol.Required("account_id"): cv.string,
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("start"): cv.date,
+        vol.Optional("end"): cv.date,
+        vol.Optional("period", default=SERIES_PERIOD_DAY): vol.In(SERIES_PERIODS),
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=DEFAULT_SERIES_LIMIT): vol.All(
+            int, vol.Range(min=1, max=MAX_SERIES_LIMIT)
+        ),
+    }
+)
+@callback
+def ws_usage_series(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a page of an account's cached daily usage.
+
+    The series is answered from the coordinator's cached history, which is
+    restored from storage at startup, so it never calls the EPB API. Long
+    windows can be summed per week or month to keep the response small.
+    """
+    history = _find_history(hass, msg["account_id"], msg.get("config_entry_id"))
+    if history is None:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"No usage history for account {msg['account_id']}",
+        )
+        return
+
+    points = history.query(msg.get("start"), msg.get("end"), msg["period"])
+    offset = msg["offset"]
+    end = offset + msg["limit"]
+    connection.send_result(
+        msg["id"],
+        {
+            "account_id": msg["account_id"],
+            "period": msg["period"],
+            "total": len(points),
+            "offset": offset,
+            "next_offset": end if end < len(points) else None,
+            "points": points[offset:end],
+        },
+    )
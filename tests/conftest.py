@@ -2,7 +2,10 @@
 
 import os
 import sys
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Any, Generator
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -11,3 +14,60 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import pytest-homeassistant-custom-component fixtures
 pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+
+ACCOUNT_LINKS = [
+    {"power_account": {"account_id": "123"}, "premise": {"gis_id": 1}},
+    {"power_account": {"account_id": "456"}, "premise": {"gis_id": 2}},
+]
+
+USAGE_REPORT = {
+    "kwh": 5.0,
+    "cost": 0.6,
+    "daily": [],
+    "comparison": {
+        "kwh_to_date": 5.0,
+        "cost_to_date": 0.6,
+        "prior_kwh": None,
+        "prior_cost": None,
+        "prior_kwh_to_date": None,
+        "prior_cost_to_date": None,
+    },
+}
+
+
+@pytest.fixture
+def mock_epb_api() -> Generator[dict[str, Mock], None, None]:
+    """Patch the EPB API client so entries and flows never hit the network.
+
+    Logging in sets a token and account discovery stores the links, as the
+    real client does, so sessions can be handed between flows and entries.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.epb.api import EPBApiClient
+
+    async def _authenticate(self: Any) -> None:
+        self._token = "test-token"
+
+    async def _get_account_links(self: Any) -> list:
+        await self._ensure_token()
+        self._account_links = ACCOUNT_LINKS
+        return ACCOUNT_LINKS
+
+    async def _get_current_usage_report(self: Any, *args: Any) -> dict:
+        await self._ensure_token()
+        return USAGE_REPORT
+
+    side_effects = {
+        "authenticate": _authenticate,
+        "get_account_links": _get_account_links,
+        "get_current_usage_report": _get_current_usage_report,
+        "get_interval_usage": None,
+    }
+    with ExitStack() as stack:
+        yield {
+            name: stack.enter_context(
+                patch.object(EPBApiClient, name, autospec=True, side_effect=side_effect)
+            )
+            for name, side_effect in side_effects.items()
+        }
@@ -0,0 +1,49 @@
+"""Test the EPB usage aggregates."""
+
+from custom_components.epb.aggregate import UsageAggregator, aggregate_groups
+
+
+def _account(account_id: str, city: str, zip_code: str) -> dict:
+    """Build an account link."""
+    return {
+        "power_account": {"account_id": account_id},
+        "premise": {"city": city, "zip_code": zip_code},
+    }
+
+
+def test_aggregate_groups() -> None:
+    """Test accounts are grouped by the configured premise field."""
+    account = _account("1", "Chattanooga", "37402")
+
+    assert aggregate_groups(account, "none") == ["total"]
+    assert aggregate_groups(account, "city") == ["total", "city:Chattanooga"]
+    assert aggregate_groups(account, "zip_code") == ["total", "zip_code:37402"]
+
+
+def test_aggregator_applies_deltas() -> None:
+    """Test account updates only apply their change to the totals."""
+    aggregator = UsageAggregator()
+    aggregator.update("1", ["total", "city:A"], 10.0, 1.0)
+    aggregator.update("2", ["total", "city:B"], 5.0, 0.5)
+
+    assert aggregator.get("total") == {"kwh": 15.0, "cost": 1.5, "accounts": 2}
+    assert aggregator.get("city:A") == {"kwh": 10.0, "cost": 1.0, "accounts": 1}
+
+    aggregator.update("1", ["total", "city:A"], 12.0, 1.25)
+
+    assert aggregator.get("total") == {"kwh": 17.0, "cost": 1.75, "accounts": 2}
+    assert aggregator.get("city:A") == {"kwh": 12.0, "cost": 1.25, "accounts": 1}
+
+
+def test_aggregator_regroup_and_remove() -> None:
+    """Test moving an account between groups and removing it."""
+    aggregator = UsageAggregator()
+    aggregator.update("1", ["total", "city:A"], 10.0, 1.0)
+    aggregator.update("1", ["total", "city:B"], 10.0, 1.0)
+
+    assert aggregator.get("city:A") is None
+    assert aggregator.get("city:B") == {"kwh": 10.0, "cost": 1.0, "accounts": 1}
+
+    aggregator.remove("1")
+
+    assert aggregator.get("total") is None
@@ -0,0 +1,64 @@
+"""Test the EPB usage anomaly detector."""
+
+from datetime import date, timedelta
+
+from custom_components.epb.anomaly import UsageAnomalyDetector
+
+
+def _series(values: list[float]) -> list[dict]:
+    """Build a daily usage series starting on the first of the month."""
+    start = date(2025, 1, 1)
+    return [
+        {"date": start + timedelta(days=index), "kwh": kwh, "cost": kwh * 0.1}
+        for index, kwh in enumerate(values)
+    ]
+
+
+def test_latest_day_is_held_back() -> None:
+    """Test the most recent, still revisable day is not folded in."""
+    detector = UsageAnomalyDetector(window=90, min_samples=3)
+    detector.update(_series([10.0, 12.0, 11.0]), threshold=3.0)
+
+    assert detector.count == 2
+    assert detector.last_date == date(2025, 1, 2)
+    assert detector.mean == 11.0
+
+
+def test_anomaly_flagged_and_cleared() -> None:
+    """Test a usage spike is flagged and cleared by the next normal day."""
+    detector = UsageAnomalyDetector(window=90, min_samples=5)
+    values = [10.0, 11.0, 9.0, 10.0, 11.0, 9.0, 10.0]
+    assert not detector.update(_series(values + [0.0]), threshold=3.0)
+
+    assert detector.update(_series(values + [40.0, 0.0]), threshold=3.0)
+    assert detector.as_dict()["anomaly"] is True
+    assert detector.as_dict()["anomaly_date"] == "2025-01-08"
+
+    assert not detector.update(_series(values + [40.0, 10.0, 0.0]), threshold=3.0)
+    assert detector.as_dict()["anomaly"] is False
+
+
+def test_no_scoring_before_min_samples() -> None:
+    """Test nothing is flagged until enough days have been seen."""
+    detector = UsageAnomalyDetector(window=90, min_samples=14)
+
+    assert not detector.update(_series([1.0, 1.5, 100.0, 0.0]), threshold=1.0)
+    assert detector.as_dict()["usage_mean"] is None
+
+
+def test_store_round_trip() -> None:
+    """Test the detector resumes from stored state without history."""
+    detector = UsageAnomalyDetector(window=90, min_samples=3)
+    detector.update(_series([10.0, 12.0, 14.0, 0.0]), threshold=3.0)
+
+    restored = UsageAnomalyDetector(window=90, min_samples=3)
+    restored.restore(detector.to_store())
+
+    assert restored.count == detector.count
+    assert restored.mean == detector.mean
+    assert restored.variance == detector.variance
+    assert restored.last_date == detector.last_date
+
+    # Days already folded before the restart are not counted twice
+    restored.update(_series([10.0, 12.0, 14.0, 13.0, 0.0]), threshold=3.0)
+    assert restored.count == 4
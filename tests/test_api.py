@@ -1,15 +1,24 @@
 """Test the EPB API client."""
 
-from datetime import datetime
+import asyncio
+import math
+from datetime import date, datetime
 from typing import Any, AsyncGenerator
 from unittest.mock import AsyncMock, Mock, patch
+from zoneinfo import ZoneInfo
 
 import aiohttp
 import pytest
 from aiohttp import ClientError, ClientSession
 
-from custom_components.epb.api import (AccountLink, EPBApiClient, EPBApiError,
-                                       EPBAuthError)
+from custom_components.epb.api import (
+    AccountLink,
+    EPBApiClient,
+    EPBApiError,
+    EPBAuthError,
+    hours_in_day,
+    usage_periods,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -58,6 +67,155 @@ async def test_authentication_failure(mock_session: AsyncMock) -> None:
         await client.authenticate()
 
 
+async def test_authentication_server_error(mock_session: AsyncMock) -> None:
+    """Test a server error is not reported as rejected credentials."""
+    mock_response = AsyncMock()
+    mock_response.status = 503
+    mock_response.text.return_value = "Service unavailable"
+
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+
+    with pytest.raises(EPBApiError) as exc_info:
+        await client.authenticate()
+    assert not isinstance(exc_info.value, EPBAuthError)
+
+
+async def test_get_usage_report_auth_error(mock_session: AsyncMock) -> None:
+    """Test a rejected login while fetching usage is not swallowed."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+
+    with patch.object(
+        client, "authenticate", AsyncMock(side_effect=EPBAuthError("rejected"))
+    ):
+        with pytest.raises(EPBAuthError):
+            await client.get_usage_report("123", 456)
+
+
+async def test_update_password(mock_session: AsyncMock) -> None:
+    """Test a new password clears the session."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    assert not client.update_password("password")
+    assert client._token == "test-token"
+    assert client.update_password("new-password")
+    assert client._token is None
+
+
+async def test_concurrent_requests_share_one_login(mock_session: AsyncMock) -> None:
+    """Test requests waiting for a token only log in once."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+
+    logins = AsyncMock()
+
+    async def _login() -> None:
+        await asyncio.sleep(0)
+        client._token = f"token-{logins.await_count}"
+
+    logins.side_effect = _login
+    with patch.object(client, "authenticate", logins):
+        await asyncio.gather(*(client._ensure_token() for _ in range(3)))
+        assert client._token == "token-1"
+
+        await asyncio.gather(*(client._renew_token("token-1") for _ in range(3)))
+        assert client._token == "token-2"
+
+    assert logins.await_count == 2
+
+
+async def test_identical_usage_queries_are_coalesced(mock_session: AsyncMock) -> None:
+    """Test identical queries in flight share one request."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    release = asyncio.Event()
+
+    async def _send(url: str, payload: dict) -> dict:
+        await release.wait()
+        return {"interval_a_totals": {"pos_kwh": 1.0, "pos_wh_est_cost": 0.1}}
+
+    with patch.object(client, "_ensure_token", AsyncMock()), patch.object(
+        client, "_send_usage", AsyncMock(side_effect=_send)
+    ) as send:
+        reports = asyncio.gather(
+            client.get_usage_report("123", 456, 2025, 1),
+            client.get_usage_report("123", 456, 2025, 1),
+            client.get_usage_report("123", 456, 2025, 2),
+        )
+        await asyncio.sleep(0)
+        release.set()
+        first, second, other = await reports
+
+    assert send.await_count == 2
+    assert first == second
+    assert other["kwh"] == 1.0
+    assert not client._in_flight
+
+
+async def test_coalesced_query_outlives_cancelled_callers(
+    mock_session: AsyncMock,
+) -> None:
+    """Test a shared query is only cancelled with its last caller."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    cancelled = asyncio.Event()
+
+    async def _send(url: str, payload: dict) -> dict:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {}
+
+    with patch.object(client, "_send_usage", AsyncMock(side_effect=_send)):
+        first = asyncio.ensure_future(client._post_usage("url", {"a": 1, "b": 2}))
+        second = asyncio.ensure_future(client._post_usage("url", {"b": 2, "a": 1}))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+        assert len(client._in_flight) == 1
+
+        second.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert not client._in_flight
+
+
+async def test_caller_after_cancelled_query_posts_again(
+    mock_session: AsyncMock,
+) -> None:
+    """Test a caller arriving while a query is being cancelled is not cancelled."""
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    calls = 0
+
+    async def _send(url: str, payload: dict) -> dict:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                # Cleaning up the request takes a few loop iterations
+                await asyncio.sleep(0)
+                raise
+        return {"ok": True}
+
+    with patch.object(client, "_send_usage", AsyncMock(side_effect=_send)):
+        first = asyncio.ensure_future(client._post_usage("url", {"a": 1}))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        assert first.cancelled()
+
+        second = asyncio.ensure_future(client._post_usage("url", {"a": 1}))
+        assert await asyncio.wait_for(second, 1) == {"ok": True}
+
+    assert calls == 2
+    assert not client._in_flight
+
+
 async def test_get_account_links_success(mock_session: AsyncMock) -> None:
     """Test successful account links retrieval."""
     mock_response = AsyncMock()
@@ -96,6 +254,190 @@ async def test_get_usage_data_success(mock_session: AsyncMock) -> None:
     mock_session.post.assert_called_once()
 
 
+async def test_get_usage_report_daily_series(mock_session: AsyncMock) -> None:
+    """Test the daily series is parsed from the compare response."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {
+        "data": [
+            {"a": {"values": {"pos_kwh": "10", "pos_wh_est_cost": "1.5"}}},
+            {"a": {"values": {"pos_kwh": "20", "pos_wh_est_cost": "3"}}},
+            {"a": {}},
+        ]
+    }
+
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    with patch("custom_components.epb.api.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 4, 3, 12, 0)
+        result = await client.get_usage_report("123", 456)
+
+    assert result["kwh"] == 20.0
+    assert result["cost"] == 3.0
+    assert [entry["date"].day for entry in result["daily"]] == [1, 2]
+    assert result["daily"][0]["kwh"] == 10.0
+    assert result["daily"][1]["cost"] == 3.0
+    assert result["comparison"]["kwh_to_date"] == 30.0
+    assert result["comparison"]["prior_kwh"] is None
+
+
+async def test_get_usage_report_raise_errors(mock_session: AsyncMock) -> None:
+    """Test a failed report can raise instead of returning an empty report."""
+    mock_response = AsyncMock()
+    mock_response.status = 500
+    mock_response.text.return_value = "Internal Server Error"
+
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    result = await client.get_usage_report("123", 456, 2025, 1)
+    assert result["daily"] == []
+
+    with pytest.raises(EPBApiError):
+        await client.get_usage_report("123", 456, 2025, 2, raise_errors=True)
+
+
+async def test_get_usage_report_comparison(mock_session: AsyncMock) -> None:
+    """Test the comparison period is parsed alongside the current period."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {
+        "data": [
+            {
+                "a": {"values": {"pos_kwh": "10", "pos_wh_est_cost": "1"}},
+                "b": {"values": {"pos_kwh": "8", "pos_wh_est_cost": "0.8"}},
+            },
+            {
+                "a": {},
+                "b": {"values": {"pos_kwh": "12", "pos_wh_est_cost": "1.2"}},
+            },
+        ],
+        "interval_b_totals": {"pos_kwh": "300", "pos_wh_est_cost": "30"},
+    }
+
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    with patch("custom_components.epb.api.datetime") as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 4, 2, 12, 0)
+        result = await client.get_usage_report("123", 456)
+
+    assert result["comparison"] == {
+        "kwh_to_date": 10.0,
+        "cost_to_date": 1.0,
+        "prior_kwh": 300.0,
+        "prior_cost": 30.0,
+        "prior_kwh_to_date": 8.0,
+        "prior_cost_to_date": 0.8,
+    }
+
+
+async def test_get_interval_usage(mock_session: AsyncMock) -> None:
+    """Test interval usage is decoded into one slot per interval."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {
+        "data": [
+            {"a": {"values": {"pos_kwh": "0.25", "pos_wh_est_cost": "0.03"}}},
+            {"a": {"values": {"pos_kwh": "0.5", "pos_wh_est_cost": "0.06"}}},
+            {"a": {}},
+        ]
+    }
+
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    kwh, cost = await client.get_interval_usage("123", 456, date(2025, 4, 3))
+
+    assert len(kwh) == len(cost) == 96
+    assert kwh[:2].tolist() == [0.25, 0.5]
+    assert math.isnan(kwh[2]) and math.isnan(cost[95])
+    payload = mock_session.post.call_args.kwargs["json"]
+    assert payload["usage_day"] == 3
+    assert mock_session.post.call_args.args[0].endswith("/compare/15min")
+
+
+async def test_get_interval_usage_daylight_saving(mock_session: AsyncMock) -> None:
+    """Test a daylight saving change day keeps every interval EPB posts."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    entry = {"a": {"values": {"pos_kwh": "0.25", "pos_wh_est_cost": "0.03"}}}
+    mock_response.json.return_value = {"data": [entry] * 100}
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    kwh, _ = await client.get_interval_usage("123", 456, date(2025, 11, 2))
+    assert len(kwh) == 100 and not math.isnan(kwh[99])
+
+    kwh, _ = await client.get_interval_usage("123", 456, date(2025, 3, 9))
+    assert len(kwh) == 92
+    assert hours_in_day(date(2025, 4, 3), ZoneInfo("America/New_York")) == 24
+
+
+def test_usage_periods() -> None:
+    """Test the closing month is only fetched during the rollover window."""
+    assert usage_periods(datetime(2025, 4, 15, 12, 0), 2) == [(2025, 4)]
+    assert usage_periods(datetime(2025, 4, 2, 23, 0), 2) == [(2025, 3), (2025, 4)]
+    assert usage_periods(datetime(2025, 1, 1, 0, 5), 2) == [(2024, 12), (2025, 1)]
+    assert usage_periods(datetime(2025, 4, 1, 0, 5), 0) == [(2025, 4)]
+
+
+async def test_get_current_usage_report_merges_rollover(
+    mock_session: AsyncMock,
+) -> None:
+    """Test the closing and opening months are merged at a month change."""
+    closing = {
+        "kwh": 20.0,
+        "cost": 2.0,
+        "daily": [
+            {"date": date(2025, 3, 30), "kwh": 10.0, "cost": 1.0},
+            {"date": date(2025, 3, 31), "kwh": 20.0, "cost": 2.0},
+        ],
+        "comparison": {"kwh_to_date": 30.0},
+    }
+    opening = {
+        "kwh": 0.0,
+        "cost": 0.0,
+        "daily": [],
+        "comparison": {"kwh_to_date": 0.0},
+    }
+    client = EPBApiClient("test@example.com", "password", mock_session)
+    client._token = "test-token"
+
+    with patch(
+        "custom_components.epb.api.local_now",
+        return_value=datetime(2025, 4, 1, 0, 30),
+    ), patch.object(
+        client, "get_usage_report", AsyncMock(side_effect=[closing, opening])
+    ) as mock_get_usage_report:
+        result = await client.get_current_usage_report(
+            "123", 456, "America/New_York", rollover_days=2
+        )
+
+    assert [call.args[2:4] for call in mock_get_usage_report.await_args_list] == [
+        (2025, 3),
+        (2025, 4),
+    ]
+    # The new month has no data yet, so the closing month's latest day is kept
+    assert result["kwh"] == 20.0
+    assert [entry["date"] for entry in result["daily"]] == [
+        date(2025, 3, 30),
+        date(2025, 3, 31),
+    ]
+    assert result["comparison"] == {"kwh_to_date": 0.0}
+
+
 async def test_token_refresh_on_expired(mock_session: AsyncMock) -> None:
     """Test token refresh when expired."""
     # Skip this test for now due to errors
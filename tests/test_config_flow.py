@@ -1,26 +1,281 @@
 """Test the config flow."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from homeassistant import config_entries, data_entry_flow
+from homeassistant.const import (CONF_PASSWORD, CONF_SCAN_INTERVAL,
+                                 CONF_USERNAME)
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.epb.api import EPBAuthError
 from custom_components.epb.config_flow import (CannotConnect, EPBConfigFlow,
-                                               InvalidAuth)
-from custom_components.epb.const import DOMAIN
+                                               InvalidAuth, account_label,
+                                               validate_input)
+from custom_components.epb.const import (CONF_ACCOUNT_PRIORITIES,
+                                         CONF_ACCOUNTS, CONF_TARIFF, DOMAIN,
+                                         PRIORITY_LOW, PRIORITY_NORMAL)
+from custom_components.epb.handoff import pop_handoff, store_handoff
 
 pytestmark = pytest.mark.asyncio
 
 
-async def test_form(hass: HomeAssistant) -> None:
-    """Test we get the form."""
-    # Skip this test for now as it requires a properly mocked Home Assistant instance
-    pytest.skip("This test requires a properly mocked Home Assistant instance")
+async def test_form(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test the user picks accounts and the entry reuses the flow's login."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "user"
 
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"},
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "accounts"
 
-async def test_form_invalid_auth(hass: HomeAssistant) -> None:
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_ACCOUNTS: []}
+    )
+    assert result["errors"] == {"base": "no_accounts"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_ACCOUNTS: ["456"]}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["title"] == "test@example.com"
+    assert result["options"] == {CONF_ACCOUNTS: ["456"]}
+    entry = result["result"]
+    assert entry.state is config_entries.ConfigEntryState.LOADED
+    assert [
+        account["power_account"]["account_id"]
+        for account in hass.data[DOMAIN][entry.entry_id].account_links
+    ] == ["456"]
+    assert mock_epb_api["authenticate"].call_count == 1
+
+
+async def test_form_invalid_auth(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
     """Test we handle invalid auth."""
-    # Skip this test for now as it requires a properly mocked Home Assistant instance
-    pytest.skip("This test requires a properly mocked Home Assistant instance")
+    mock_epb_api["authenticate"].side_effect = EPBAuthError("rejected")
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_USERNAME: "test@example.com", CONF_PASSWORD: "wrong"},
+    )
+
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+
+async def _setup_entry(
+    hass: HomeAssistant, options: dict | None = None
+) -> MockConfigEntry:
+    """Set up a loaded entry with the given options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"},
+        options=options or {},
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _setup_rejected_entry(hass: HomeAssistant, mock_epb_api: dict[str, Mock]):
+    """Set up an entry whose login EPB then rejects, returning its reauth flow."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    report = mock_epb_api["get_current_usage_report"].side_effect
+    mock_epb_api["get_current_usage_report"].side_effect = EPBAuthError("locked")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    mock_epb_api["get_current_usage_report"].side_effect = report
+
+    assert not coordinator.last_update_success
+    assert coordinator._unsub_refresh is None
+    (flow,) = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert flow["context"]["source"] == config_entries.SOURCE_REAUTH
+    return entry, coordinator, flow
+
+
+@pytest.mark.parametrize("password", ["password", "new-password"])
+async def test_reauth_resumes_polling(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+    password: str,
+) -> None:
+    """Test a successful reauth resumes polling, even with the same password."""
+    entry, coordinator, flow = await _setup_rejected_entry(hass, mock_epb_api)
+
+    result = await hass.config_entries.flow.async_configure(
+        flow["flow_id"], {CONF_PASSWORD: password}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.data[CONF_PASSWORD] == password
+    # The running coordinator is resumed rather than reloaded
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.client.has_password(password)
+    assert coordinator.last_update_success
+    assert coordinator._unsub_refresh is not None
+
+
+async def test_reauth_invalid_password(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test a wrong password during reauth leaves the entry untouched."""
+    entry, coordinator, flow = await _setup_rejected_entry(hass, mock_epb_api)
+    mock_epb_api["authenticate"].side_effect = EPBAuthError("rejected")
+
+    result = await hass.config_entries.flow.async_configure(
+        flow["flow_id"], {CONF_PASSWORD: "wrong"}
+    )
+
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+    assert entry.data[CONF_PASSWORD] == "password"
+    assert coordinator.client.has_password("password")
+
+
+async def test_options_accounts_and_priorities(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test accounts must be selected and each gets a polling priority."""
+    entry = await _setup_entry(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SCAN_INTERVAL: 30, CONF_ACCOUNTS: []}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["errors"] == {"base": "no_accounts"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SCAN_INTERVAL: 30, CONF_ACCOUNTS: ["123", "456"]}
+    )
+    assert result["step_id"] == "priorities"
+    assert set(result["data_schema"].schema) == {"123", "456"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"123": PRIORITY_LOW, "456": PRIORITY_NORMAL}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_ACCOUNTS] == ["123", "456"]
+    assert entry.options[CONF_SCAN_INTERVAL] == 30
+    # Only accounts that differ from the default priority are stored
+    assert entry.options[CONF_ACCOUNT_PRIORITIES] == {"123": PRIORITY_LOW}
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.account_priorities == {"123": PRIORITY_LOW}
+
+
+async def test_options_clear_tariff(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test leaving the tariff field empty removes the saved tariff."""
+    entry = await _setup_entry(hass, {CONF_TARIFF: {"type": "flat", "rate": 0.12}})
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_SCAN_INTERVAL: 30}
+    )
+    assert result["step_id"] == "priorities"
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {})
+    await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert CONF_TARIFF not in entry.options
+    assert entry.options[CONF_SCAN_INTERVAL] == 30
+
+
+async def test_validate_input_returns_session() -> None:
+    """Test validation hands back the authenticated session."""
+    session = {
+        "token": "test-token",
+        "expires_at": None,
+        "account_links": [{"power_account": {"account_id": "123"}}],
+    }
+    hass = Mock()
+    with patch(
+        "custom_components.epb.config_flow.acquire_client"
+    ) as mock_acquire, patch(
+        "custom_components.epb.config_flow.release_client"
+    ) as mock_release:
+        mock_client = mock_acquire.return_value
+        mock_client.get_account_links = AsyncMock()
+        mock_client.export_session.return_value = session
+
+        result = await validate_input(
+            hass, {CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"}
+        )
+
+    assert result == session
+    mock_acquire.assert_called_once_with(hass, "test@example.com", "password")
+    mock_client.get_account_links.assert_awaited_once()
+    mock_release.assert_called_once_with(hass, mock_client)
+
+
+def test_handoff_is_taken_once() -> None:
+    """Test a handed off session can only be taken once."""
+    hass = Mock()
+    hass.data = {}
+    session = {"token": "test-token", "expires_at": None, "account_links": []}
+
+    store_handoff(hass, "test@example.com", session)
+
+    assert pop_handoff(hass, "other@example.com") is None
+    assert pop_handoff(hass, "test@example.com") == session
+    assert pop_handoff(hass, "test@example.com") is None
+
+
+def test_handoff_expires() -> None:
+    """Test a stale handed off session is not reused."""
+    hass = Mock()
+    hass.data = {}
+    session = {"token": "test-token", "expires_at": None, "account_links": []}
+
+    with patch("custom_components.epb.handoff.time.monotonic", return_value=0):
+        store_handoff(hass, "test@example.com", session)
+    with patch("custom_components.epb.handoff.time.monotonic", return_value=3600):
+        assert pop_handoff(hass, "test@example.com") is None
+
+
+def test_account_label() -> None:
+    """Test account labels used for account selection."""
+    account = {
+        "power_account": {"account_id": "123", "nickname": "Home"},
+        "premise": {"full_service_address": "1 Main St"},
+    }
+
+    assert account_label(account) == "123 (Home - 1 Main St)"
+    assert account_label({"power_account": {"account_id": "456"}}) == "456"
@@ -0,0 +1,212 @@
+"""Test the EPB update coordinator."""
+
+import asyncio
+from array import array
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.epb.api import EPBAuthError, local_now
+from custom_components.epb.const import INTERVAL_BACKFILL_DAYS
+from custom_components.epb.coordinator import EPBUpdateCoordinator
+from custom_components.epb.tariff import Tariff
+
+pytestmark = pytest.mark.asyncio
+
+ACCOUNT_LINKS = [
+    {"power_account": {"account_id": "123"}, "premise": {"gis_id": 1}},
+    {"power_account": {"account_id": "456"}, "premise": {"gis_id": 2}},
+]
+
+
+def _report(*args: object) -> dict:
+    """Build an empty usage report."""
+    return {
+        "kwh": 1.0,
+        "cost": 0.1,
+        "daily": [],
+        "comparison": {
+            "kwh_to_date": 0.0,
+            "cost_to_date": 0.0,
+            "prior_kwh": None,
+            "prior_cost": None,
+            "prior_kwh_to_date": None,
+            "prior_cost_to_date": None,
+        },
+    }
+
+
+@pytest.fixture
+def mock_client() -> Mock:
+    """Create a mock API client."""
+    client = Mock()
+    client.get_account_links = AsyncMock(return_value=ACCOUNT_LINKS)
+    client.get_current_usage_report = AsyncMock(side_effect=_report)
+    return client
+
+
+async def test_excluded_accounts_are_not_polled(mock_client: Mock) -> None:
+    """Test only the selected accounts are fetched."""
+    coordinator = EPBUpdateCoordinator(
+        Mock(), mock_client, timedelta(minutes=15), accounts=["456"]
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert list(data) == ["456"]
+    assert [
+        link["power_account"]["account_id"] for link in coordinator.all_account_links
+    ] == [
+        "123",
+        "456",
+    ]
+    mock_client.get_current_usage_report.assert_awaited_once_with("456", 2, None, 2)
+
+
+async def test_low_priority_accounts_use_their_own_interval(
+    mock_client: Mock,
+) -> None:
+    """Test low priority accounts are only fetched once their interval passes."""
+    coordinator = EPBUpdateCoordinator(
+        Mock(),
+        mock_client,
+        timedelta(minutes=15),
+        account_priorities={"123": "low"},
+        low_priority_interval=timedelta(hours=3),
+    )
+    coordinator.data = await coordinator._async_update_data()
+    assert mock_client.get_current_usage_report.await_count == 2
+
+    coordinator.data = await coordinator._async_update_data()
+    assert mock_client.get_current_usage_report.await_count == 3
+    assert "123" in coordinator.data
+
+    coordinator._last_fetched["123"] = dt_util.utcnow() - timedelta(hours=4)
+    coordinator.data = await coordinator._async_update_data()
+    assert mock_client.get_current_usage_report.await_count == 5
+
+
+async def test_interval_usage_is_fetched_incrementally(mock_client: Mock) -> None:
+    """Test intervals are backfilled once, then only unfinished days fetched."""
+    full = (array("f", [0.25] * 96), array("f", [0.03] * 96))
+    mock_client.get_interval_usage = AsyncMock(return_value=full)
+    hass = Mock()
+    hass.config.components = set()
+    coordinator = EPBUpdateCoordinator(
+        hass, mock_client, timedelta(minutes=15), accounts=["123"], interval_usage=True
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert mock_client.get_interval_usage.await_count == INTERVAL_BACKFILL_DAYS
+    assert data["123"]["last_hour_kwh"] == 1.0
+    assert len(coordinator.intervals["123"]) == INTERVAL_BACKFILL_DAYS
+
+    mock_client.get_interval_usage.reset_mock()
+    await coordinator._async_update_data()
+
+    mock_client.get_interval_usage.assert_not_awaited()
+
+
+async def test_tariff_prices_month_to_date(mock_client: Mock) -> None:
+    """Test the local tariff prices the days cached this month."""
+    report = _report()
+    report["daily"] = [{"date": local_now(None).date(), "kwh": 10.0, "cost": 9.0}]
+    mock_client.get_current_usage_report = AsyncMock(return_value=report)
+    coordinator = EPBUpdateCoordinator(
+        Mock(),
+        mock_client,
+        timedelta(minutes=15),
+        accounts=["123"],
+        tariff=Tariff({"type": "flat", "rate": 0.1, "fixed_monthly": 5}),
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert data["123"]["tariff_cost"] == 6.0
+    assert data["123"]["tariff_energy_charge"] == 1.0
+    assert data["123"]["tariff_fixed_charge"] == 5.0
+
+
+async def test_slow_accounts_miss_the_deadline(mock_client: Mock) -> None:
+    """Test a hung fetch is cancelled and its account kept as stale."""
+    hung = asyncio.Event()
+
+    async def _fetch(account_id: str, *args: object) -> dict:
+        if account_id == "123":
+            try:
+                await hung.wait()
+            except asyncio.CancelledError:
+                hung.set()
+                raise
+        return _report()
+
+    mock_client.get_current_usage_report = AsyncMock(side_effect=_fetch)
+    coordinator = EPBUpdateCoordinator(
+        Mock(),
+        mock_client,
+        timedelta(minutes=15),
+        refresh_deadline=timedelta(seconds=0.05),
+    )
+    coordinator.data = {"123": {"kwh": 5.0, "stale": False}}
+
+    data = await coordinator._async_update_data()
+
+    assert hung.is_set()
+    assert data["123"] == {"kwh": 5.0, "stale": True}
+    assert data["456"]["kwh"] == 1.0
+    assert data["456"]["stale"] is False
+    assert "123" not in coordinator._last_fetched
+
+
+async def test_slow_interval_backfill_keeps_daily_values(mock_client: Mock) -> None:
+    """Test a backfill cut off by the deadline keeps the account's daily values."""
+    full = (array("f", [0.25] * 96), array("f", [0.03] * 96))
+    hung = asyncio.Event()
+    fetched_days = 0
+
+    async def _fetch_intervals(*args: object) -> tuple:
+        nonlocal fetched_days
+        if fetched_days == 2:
+            await hung.wait()
+        fetched_days += 1
+        return full
+
+    mock_client.get_interval_usage = AsyncMock(side_effect=_fetch_intervals)
+    hass = Mock()
+    hass.config.components = set()
+    coordinator = EPBUpdateCoordinator(
+        hass,
+        mock_client,
+        timedelta(minutes=15),
+        accounts=["123"],
+        interval_usage=True,
+        refresh_deadline=timedelta(seconds=0.05),
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert data["123"]["kwh"] == 1.0
+    assert data["123"]["stale"] is False
+    assert data["123"]["last_hour_kwh"] == 1.0
+    assert len(coordinator.intervals["123"]) == 2
+
+    # The next update picks the backfill up where it stopped
+    hung.set()
+    await coordinator._async_update_data()
+
+    assert len(coordinator.intervals["123"]) == INTERVAL_BACKFILL_DAYS
+
+
+async def test_rejected_login_stops_polling(mock_client: Mock) -> None:
+    """Test a rejected login asks for reauthentication instead of failing."""
+    mock_client.get_current_usage_report = AsyncMock(
+        side_effect=EPBAuthError("rejected")
+    )
+    coordinator = EPBUpdateCoordinator(Mock(), mock_client, timedelta(minutes=15))
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
@@ -0,0 +1,148 @@
+"""Test the EPB usage export."""
+
+import calendar
+import csv
+from datetime import date
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.epb.api import EPBApiError
+from custom_components.epb.export import EPBExportError, async_export_usage
+
+pytestmark = pytest.mark.asyncio
+
+
+def _report(
+    account_id: str, gis_id: int, year: int, month: int, raise_errors: bool = False
+) -> dict:
+    """Build a usage report with one kWh per day of the month."""
+    days = calendar.monthrange(year, month)[1]
+    return {
+        "kwh": 1.0,
+        "cost": 0.1,
+        "daily": [
+            {"date": date(year, month, day), "kwh": 1.0, "cost": 0.1}
+            for day in range(1, days + 1)
+        ],
+    }
+
+
+@pytest.fixture
+def mock_client() -> Mock:
+    """Create a mock API client."""
+    client = Mock()
+    client.get_usage_report = AsyncMock(side_effect=_report)
+    return client
+
+
+def _read_rows(path: Path) -> list[dict]:
+    """Read the rows of an exported CSV file."""
+    with path.open(newline="", encoding="utf-8") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+async def test_export_csv(mock_client: Mock, tmp_path: Path) -> None:
+    """Test exporting a date range to CSV."""
+    path = tmp_path / "usage.csv"
+
+    rows = await async_export_usage(
+        mock_client, [("123", 456)], date(2024, 1, 15), date(2024, 3, 10), path
+    )
+
+    assert rows == 17 + 29 + 10
+    assert mock_client.get_usage_report.await_count == 3
+    exported = _read_rows(path)
+    assert exported[0] == {
+        "account_id": "123",
+        "date": "2024-01-15",
+        "kwh": "1.0",
+        "cost": "0.1",
+    }
+    assert exported[-1]["date"] == "2024-03-10"
+
+
+async def test_export_csv_resumes(mock_client: Mock, tmp_path: Path) -> None:
+    """Test a second export continues from the last exported day."""
+    path = tmp_path / "usage.csv"
+    await async_export_usage(
+        mock_client, [("123", 456)], date(2024, 1, 1), date(2024, 1, 20), path
+    )
+    mock_client.get_usage_report.reset_mock()
+
+    rows = await async_export_usage(
+        mock_client,
+        [("123", 456)],
+        date(2024, 1, 1),
+        date(2024, 2, 5),
+        path,
+        concurrency=1,
+    )
+
+    assert rows == 11 + 5
+    assert [call.args[2:] for call in mock_client.get_usage_report.await_args_list] == [
+        (2024, 1),
+        (2024, 2),
+    ]
+    dates = [row["date"] for row in _read_rows(path)]
+    assert len(dates) == len(set(dates)) == 36
+
+
+async def test_export_invalid_format(mock_client: Mock, tmp_path: Path) -> None:
+    """Test an unsupported format is rejected."""
+    with pytest.raises(EPBExportError):
+        await async_export_usage(
+            mock_client,
+            [("123", 456)],
+            date(2024, 1, 1),
+            date(2024, 1, 2),
+            tmp_path / "usage.xlsx",
+            "xlsx",
+        )
+
+
+async def test_export_stops_at_failed_month(mock_client: Mock, tmp_path: Path) -> None:
+    """Test an account stops at a failed month and a rerun fills the gap."""
+    path = tmp_path / "usage.csv"
+
+    def _flaky_report(
+        account_id: str, gis_id: int, year: int, month: int, raise_errors: bool
+    ) -> dict:
+        assert raise_errors
+        if (account_id, month) == ("123", 2):
+            raise EPBApiError("Failed to get usage data")
+        return _report(account_id, gis_id, year, month)
+
+    mock_client.get_usage_report.side_effect = _flaky_report
+
+    with pytest.raises(EPBExportError, match=r"123 \(2024-02"):
+        await async_export_usage(
+            mock_client,
+            [("123", 456), ("789", 12)],
+            date(2024, 1, 1),
+            date(2024, 3, 31),
+            path,
+            concurrency=3,
+        )
+
+    exported = _read_rows(path)
+    # March was fetched alongside the failed month but is not written past it
+    assert {row["date"][:7] for row in exported if row["account_id"] == "123"} == {
+        "2024-01"
+    }
+    assert len([row for row in exported if row["account_id"] == "789"]) == 91
+
+    mock_client.get_usage_report.side_effect = _report
+    mock_client.get_usage_report.reset_mock()
+    rows = await async_export_usage(
+        mock_client,
+        [("123", 456), ("789", 12)],
+        date(2024, 1, 1),
+        date(2024, 3, 31),
+        path,
+    )
+
+    assert rows == 29 + 31
+    dates = [row["date"] for row in _read_rows(path) if row["account_id"] == "123"]
+    assert len(dates) == len(set(dates)) == 91
@@ -0,0 +1,98 @@
+"""Test the EPB usage forecast."""
+
+from datetime import date
+
+from custom_components.epb.forecast import UsageForecast
+
+
+def _day(day: int, kwh: float, cost: float, month: int = 4) -> dict:
+    """Build a daily usage entry."""
+    return {"date": date(2025, month, day), "kwh": kwh, "cost": cost}
+
+
+def test_forecast_empty() -> None:
+    """Test the forecast before any data has been folded in."""
+    forecast = UsageForecast()
+    forecast.update([])
+
+    assert forecast.as_dict() == {
+        "daily_run_rate_kwh": None,
+        "daily_run_rate_cost": None,
+        "projected_kwh": None,
+        "projected_cost": None,
+    }
+
+
+def test_forecast_projection() -> None:
+    """Test the run rate and month-end projection."""
+    forecast = UsageForecast()
+    forecast.update([_day(1, 10.0, 1.0), _day(2, 20.0, 2.0)])
+
+    result = forecast.as_dict()
+    assert result["daily_run_rate_kwh"] == 15.0
+    assert result["daily_run_rate_cost"] == 1.5
+    assert result["projected_kwh"] == 450.0
+    assert result["projected_cost"] == 45.0
+
+
+def test_forecast_incremental_and_revised_day() -> None:
+    """Test that only new or revised days change the totals."""
+    forecast = UsageForecast()
+    forecast.update([_day(1, 10.0, 1.0), _day(2, 5.0, 0.5)])
+    # Day 2 is revised upwards and day 3 is posted
+    forecast.update([_day(1, 10.0, 1.0), _day(2, 20.0, 2.0), _day(3, 30.0, 3.0)])
+
+    assert forecast.days == 3
+    assert forecast.kwh_total == 60.0
+    assert forecast.cost_total == 6.0
+
+
+def test_forecast_revision_after_next_day() -> None:
+    """Test a day revised after a newer day was posted updates the totals."""
+    forecast = UsageForecast()
+    forecast.update([_day(1, 10.0, 1.0), _day(2, 10.0, 1.0), _day(3, 4.0, 0.4)])
+    forecast.update(
+        [_day(1, 10.0, 1.0), _day(2, 10.0, 1.0), _day(3, 6.0, 0.6), _day(4, 1.0, 0.1)]
+    )
+    forecast.update(
+        [_day(1, 10.0, 1.0), _day(2, 10.0, 1.0), _day(3, 10.0, 1.0), _day(4, 5.0, 0.5)]
+    )
+
+    assert forecast.days == 4
+    assert forecast.kwh_total == 35.0
+    assert forecast.cost_total == 3.5
+
+
+def test_forecast_month_rollover() -> None:
+    """Test that a new month resets the running totals."""
+    forecast = UsageForecast()
+    forecast.update([_day(29, 10.0, 1.0), _day(30, 10.0, 1.0)])
+    forecast.update([_day(1, 12.0, 1.2, month=5)])
+
+    assert (forecast.year, forecast.month) == (2025, 5)
+    assert forecast.days == 1
+    assert forecast.as_dict()["projected_kwh"] == 372.0
+
+
+def test_forecast_excludes_current_day() -> None:
+    """Test the day still being posted is left out of the run rate."""
+    forecast = UsageForecast()
+    forecast.update([_day(1, 10.0, 1.0), _day(2, 20.0, 2.0), _day(3, 2.0, 0.2)])
+
+    result = forecast.as_dict(date(2025, 4, 3))
+    assert result["daily_run_rate_kwh"] == 15.0
+    assert result["projected_kwh"] == 450.0
+    # The running totals still follow the day as it is posted
+    assert forecast.kwh_total == 32.0
+
+    # Once the day is over it counts like any other
+    assert forecast.as_dict(date(2025, 4, 4))["daily_run_rate_kwh"] == 10.667
+
+
+def test_forecast_first_day_in_progress() -> None:
+    """Test there is no run rate until the month's first day is over."""
+    forecast = UsageForecast()
+    forecast.update([_day(1, 3.0, 0.3)])
+
+    assert forecast.as_dict(date(2025, 4, 1))["projected_kwh"] is None
+    assert forecast.as_dict(date(2025, 4, 2))["projected_kwh"] == 90.0
@@ -0,0 +1,54 @@
+"""Test the EPB usage history."""
+
+from datetime import date
+
+from custom_components.epb.history import UsageHistory
+
+
+def _day(month: int, day: int, kwh: float) -> dict:
+    """Build a daily usage entry."""
+    return {"date": date(2025, month, day), "kwh": kwh, "cost": kwh / 10}
+
+
+def test_history_merges_revised_days() -> None:
+    """Test that refreshed days overwrite the ones already held."""
+    history = UsageHistory()
+    history.update([_day(4, 2, 10.0), _day(4, 1, 5.0)])
+    history.update([_day(4, 2, 12.0), _day(4, 3, 8.0)])
+
+    assert len(history) == 3
+    assert history.query() == [
+        {"date": "2025-04-01", "kwh": 5.0, "cost": 0.5},
+        {"date": "2025-04-02", "kwh": 12.0, "cost": 1.2},
+        {"date": "2025-04-03", "kwh": 8.0, "cost": 0.8},
+    ]
+    assert [point["date"] for point in history.query(date(2025, 4, 2))] == [
+        "2025-04-02",
+        "2025-04-03",
+    ]
+
+
+def test_history_periods() -> None:
+    """Test that days are summed per week and month."""
+    history = UsageHistory()
+    history.update([_day(3, 31, 1.0), _day(4, 1, 2.0), _day(4, 7, 4.0)])
+
+    assert history.query(period="week") == [
+        {"date": "2025-03-31", "kwh": 3.0, "cost": 0.3},
+        {"date": "2025-04-07", "kwh": 4.0, "cost": 0.4},
+    ]
+    assert history.query(end=date(2025, 4, 6), period="month") == [
+        {"date": "2025-03-01", "kwh": 1.0, "cost": 0.1},
+        {"date": "2025-04-01", "kwh": 2.0, "cost": 0.2},
+    ]
+
+
+def test_history_store_round_trip() -> None:
+    """Test that the history survives a save and restore."""
+    history = UsageHistory()
+    history.update([_day(4, 1, 5.0), _day(4, 2, 6.0)])
+
+    restored = UsageHistory()
+    restored.restore(history.to_store())
+
+    assert restored.query() == history.query()
@@ -0,0 +1,59 @@
+"""Test setting up and unloading EPB config entries."""
+
+from unittest.mock import Mock
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.epb.const import CONF_AGGREGATE_GROUPING, DOMAIN
+
+
+async def test_setup_and_unload_entry(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test an entry creates its sensors and cleans up when unloaded."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"},
+        options={CONF_AGGREGATE_GROUPING: "none"},
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.epb_energy_123").state == "5.0"
+    assert hass.states.get("sensor.epb_cost_456").state == "0.6"
+    assert mock_epb_api["authenticate"].call_count == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert entry.entry_id not in hass.data[DOMAIN]
+
+
+async def test_reload_reuses_the_session(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test reloading an entry does not log in again."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"},
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert mock_epb_api["authenticate"].call_count == 1
@@ -0,0 +1,137 @@
+"""Test the EPB interval usage history."""
+
+import math
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.epb.interval import IntervalHistory
+
+ZONE = ZoneInfo("America/New_York")
+
+
+def _slots(posted: int, kwh: float = 0.25, slots: int = 96) -> tuple[array, array]:
+    """Build a day with the first ``posted`` intervals posted."""
+    values = [kwh] * posted + [math.nan] * (slots - posted)
+    return array("f", values), array("f", [value / 10 for value in values])
+
+
+def test_days_to_fetch() -> None:
+    """Test that only days that may still change are fetched."""
+    history = IntervalHistory(96, 366)
+    today = date(2025, 4, 10)
+
+    assert len(history.days_to_fetch(today, 7)) == 7
+
+    history.update(date(2025, 4, 8), *_slots(96))
+    history.update(date(2025, 4, 9), *_slots(96))
+    history.update(date(2025, 4, 10), *_slots(40))
+
+    assert history.days_to_fetch(today, 7) == [date(2025, 4, 10)]
+    assert history.days_to_fetch(date(2025, 4, 11), 7) == [
+        date(2025, 4, 10),
+        date(2025, 4, 11),
+    ]
+
+
+def test_update_merges_posted_intervals() -> None:
+    """Test that a refetched day only fills in the posted intervals."""
+    history = IntervalHistory(96, 366)
+    day = date(2025, 4, 10)
+    history.update(day, *_slots(96, 0.5))
+    history.update(day, *_slots(4, 1.0))
+
+    kwh, _ = history.day(day)
+    assert kwh[:5].tolist() == [1.0, 1.0, 1.0, 1.0, 0.5]
+    assert history.is_complete(day)
+
+
+def test_hours_after_and_latest_hour() -> None:
+    """Test hourly totals stop at the first hour still being posted."""
+    history = IntervalHistory(96, 366)
+    day = date(2025, 4, 10)
+    history.update(day, *_slots(10))
+    settled = datetime(2025, 4, 1, tzinfo=ZONE)
+
+    hours = history.hours_after(None, ZONE, settled)
+
+    assert [start.hour for start, _, _ in hours] == [0, 1]
+    assert hours[0][1] == 1.0
+    assert history.hours_after(hours[-1][0], ZONE, settled) == []
+    assert history.latest_hour(ZONE)[0] == datetime(2025, 4, 10, 1, tzinfo=ZONE)
+
+    # Once the hour is settled its posted intervals are reported
+    late = history.hours_after(hours[-1][0], ZONE, settled + timedelta(days=30))
+    assert late[0][1] == 0.5
+
+
+@pytest.mark.parametrize(
+    ("day", "slots", "repeated"),
+    [(date(2025, 3, 9), 92, 0), (date(2025, 11, 2), 100, 1)],
+)
+def test_daylight_saving_days(day: date, slots: int, repeated: int) -> None:
+    """Test each hour of a daylight saving change day gets its own start."""
+    history = IntervalHistory(96, 366)
+    kwh, cost = _slots(slots, slots=slots)
+    kwh[slots - 1] = 2.0
+    history.update(day, kwh, cost)
+
+    hours = history.hours_after(None, ZONE, datetime(2025, 1, 1, tzinfo=ZONE))
+    starts = [start.astimezone(timezone.utc) for start, _, _ in hours]
+
+    assert len(hours) == slots // 4
+    assert starts == sorted(set(starts))
+    assert starts[-1] == starts[0] + timedelta(hours=slots // 4 - 1)
+    local_hours = [start.hour for start, _, _ in hours]
+    assert local_hours.count(1) == 1 + repeated
+    assert local_hours.count(2) == repeated
+    # The last slot belongs to the hour before the next local midnight
+    assert hours[-1][0].hour == 23
+    assert hours[-1][1] == 2.75
+    assert history.latest_hour(ZONE)[0] == hours[-1][0]
+
+
+def test_complete_kwh_by_local_time() -> None:
+    """Test daylight saving change days are lined up by local time of day."""
+    history = IntervalHistory(96, 366)
+    spring, fall = date(2025, 3, 9), date(2025, 11, 2)
+    history.update(spring, *_slots(92, slots=92))
+    history.update(fall, *_slots(100, slots=100))
+    history.update(date(2025, 4, 10), *_slots(95))
+
+    by_clock = history.complete_kwh(spring, ZONE)
+    assert len(by_clock) == 96
+    assert by_clock[8:12].tolist() == [0.0] * 4
+    assert sum(by_clock) == 23.0
+
+    by_clock = history.complete_kwh(fall, ZONE)
+    assert by_clock[4:8].tolist() == [0.5] * 4
+    assert sum(by_clock) == 25.0
+
+    assert history.complete_kwh(date(2025, 4, 10), ZONE) is None
+
+
+def test_unexpected_interval_count() -> None:
+    """Test a day that does not add up to whole hours is rejected."""
+    history = IntervalHistory(96, 366)
+
+    with pytest.raises(ValueError):
+        history.update(date(2025, 4, 10), *_slots(90, slots=90))
+
+
+def test_prune_and_store_round_trip() -> None:
+    """Test retention and that the history survives a save and restore."""
+    history = IntervalHistory(96, 2)
+    history.update(date(2025, 4, 8), *_slots(96))
+    history.update(date(2025, 4, 10), *_slots(20))
+    history.prune(date(2025, 4, 10))
+
+    restored = IntervalHistory(96, 2)
+    restored.restore(history.to_store())
+
+    assert len(restored) == 1
+    assert restored.day(date(2025, 4, 10))[0].tobytes() == (
+        history.day(date(2025, 4, 10))[0].tobytes()
+    )
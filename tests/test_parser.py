@@ -0,0 +1,196 @@
+"""Test the EPB usage payload parser."""
+
+import calendar
+from datetime import date
+from typing import Any, Optional
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from custom_components.epb.parser import (
+    SHAPE_AVERAGES,
+    SHAPE_DAILY,
+    SHAPE_TOTALS,
+    SHAPE_UNKNOWN,
+    UsagePayloadParser,
+    detect_shape,
+)
+
+ENDPOINT = "https://api.epb.com/web/api/v1/usage/power/permanent/compare/daily"
+
+
+def _reference_parse(data: dict, year: int, month: int) -> dict:
+    """Parse a payload the way the client did before shapes were cached."""
+    latest = {"kwh": 0.0, "cost": 0.0}
+    found = None
+    for entry in reversed(data.get("data") or []):
+        if "values" in (entry.get("a") or {}):
+            found = entry["a"]["values"]
+            break
+    if found:
+        latest = found
+    elif "interval_a_totals" in data:
+        latest = data["interval_a_totals"]
+    elif "interval_a_averages" in data:
+        latest = data["interval_a_averages"]
+
+    series = []
+    comparison: dict[str, Any] = {
+        "kwh_to_date": 0.0,
+        "cost_to_date": 0.0,
+        "prior_kwh": None,
+        "prior_cost": None,
+        "prior_kwh_to_date": None,
+        "prior_cost_to_date": None,
+    }
+    prior = [0.0, 0.0, 0.0, 0.0]
+    has_prior = False
+    days_in_month = calendar.monthrange(year, month)[1]
+    for index, entry in enumerate((data.get("data") or [])[:days_in_month]):
+        values = (entry.get("a") or {}).get("values")
+        prior_values = (entry.get("b") or {}).get("values")
+        if prior_values:
+            has_prior = True
+            prior[0] += float(prior_values.get("pos_kwh", 0))
+            prior[1] += float(prior_values.get("pos_wh_est_cost", 0))
+            if values:
+                prior[2] += float(prior_values.get("pos_kwh", 0))
+                prior[3] += float(prior_values.get("pos_wh_est_cost", 0))
+        if not values:
+            continue
+        kwh = float(values.get("pos_kwh", 0))
+        cost = float(values.get("pos_wh_est_cost", 0))
+        comparison["kwh_to_date"] += kwh
+        comparison["cost_to_date"] += cost
+        series.append({"date": date(year, month, index + 1), "kwh": kwh, "cost": cost})
+    if has_prior:
+        totals = data.get("interval_b_totals") or {}
+        comparison["prior_kwh"] = float(totals.get("pos_kwh", prior[0]))
+        comparison["prior_cost"] = float(totals.get("pos_wh_est_cost", prior[1]))
+        comparison["prior_kwh_to_date"] = prior[2]
+        comparison["prior_cost_to_date"] = prior[3]
+
+    return {
+        "kwh": float(latest.get("pos_kwh", 0)),
+        "cost": float(latest.get("pos_wh_est_cost", 0)),
+        "daily": series,
+        "comparison": comparison,
+    }
+
+
+_amount = st.floats(min_value=0, max_value=1000, allow_nan=False)
+_values = st.fixed_dictionaries(
+    {}, optional={"pos_kwh": _amount, "pos_wh_est_cost": _amount}
+)
+_period = st.one_of(st.none(), st.just({}), st.fixed_dictionaries({"values": _values}))
+_entry = st.fixed_dictionaries({}, optional={"a": _period, "b": _period})
+
+
+@st.composite
+def _payloads(draw: st.DrawFn) -> tuple[dict, int, int]:
+    """Build a usage payload of any supported shape."""
+    year = draw(st.integers(min_value=2020, max_value=2030))
+    month = draw(st.integers(min_value=1, max_value=12))
+    days = calendar.monthrange(year, month)[1]
+    payload = draw(
+        st.fixed_dictionaries(
+            {},
+            optional={
+                "data": st.lists(_entry, max_size=days + 2),
+                "interval_a_totals": _values,
+                "interval_a_averages": _values,
+                "interval_b_totals": _values,
+            },
+        )
+    )
+    return payload, year, month
+
+
+def _daily(*kwh: Optional[float]) -> dict:
+    """Build a daily payload; None marks a day that has not been posted."""
+    return {
+        "data": [
+            {"a": {} if value is None else {"values": {"pos_kwh": value}}}
+            for value in kwh
+        ]
+    }
+
+
+@given(_payloads())
+def test_parse_matches_reference(case: tuple[dict, int, int]) -> None:
+    """Test that a cold parse matches the reference parser."""
+    payload, year, month = case
+    parser = UsagePayloadParser()
+
+    assert parser.parse(ENDPOINT, payload, year, month) == _reference_parse(
+        payload, year, month
+    )
+
+
+@given(st.lists(_payloads(), min_size=2, max_size=6))
+def test_cached_parse_matches_reference(cases: list[tuple[dict, int, int]]) -> None:
+    """Test that reusing a cached shape never changes the parsed result."""
+    parser = UsagePayloadParser()
+
+    for payload, year, month in cases:
+        assert parser.parse(ENDPOINT, payload, year, month) == _reference_parse(
+            payload, year, month
+        )
+        assert parser.shape(ENDPOINT) == detect_shape(payload)
+
+
+def test_detect_shape() -> None:
+    """Test shape detection precedence."""
+    totals = {"interval_a_totals": {"pos_kwh": 1}}
+    averages = {"interval_a_averages": {"pos_kwh": 1}}
+
+    assert detect_shape({**_daily(1.0), **totals}) == SHAPE_DAILY
+    assert detect_shape({**_daily(None), **totals, **averages}) == SHAPE_TOTALS
+    assert detect_shape(averages) == SHAPE_AVERAGES
+    assert detect_shape({}) == SHAPE_UNKNOWN
+
+
+def test_shape_is_redetected_when_payload_changes() -> None:
+    """Test that the parser falls back to detection when the cached shape misses."""
+    parser = UsagePayloadParser()
+
+    parser.parse(ENDPOINT, _daily(1.0, 2.0), 2025, 4)
+    assert parser.shape(ENDPOINT) == SHAPE_DAILY
+
+    report = parser.parse(ENDPOINT, {"interval_a_totals": {"pos_kwh": 30.0}}, 2025, 5)
+    assert report["kwh"] == 30.0
+    assert parser.shape(ENDPOINT) == SHAPE_TOTALS
+
+    report = parser.parse(ENDPOINT, _daily(4.0), 2025, 6)
+    assert report["kwh"] == 4.0
+    assert parser.shape(ENDPOINT) == SHAPE_DAILY
+
+
+def test_malformed_payload_yields_zeros() -> None:
+    """Test that a malformed payload is reported as zero usage."""
+    parser = UsagePayloadParser()
+
+    report = parser.parse(ENDPOINT, {"data": [{"a": {"values": "bad"}}]}, 2025, 4)
+
+    assert report["kwh"] == 0.0
+    assert report["daily"] == []
+    assert parser.shape(ENDPOINT) is None
+
+
+def test_cached_averages_do_not_shadow_totals() -> None:
+    """Test that totals still win once the averages shape has been cached."""
+    parser = UsagePayloadParser()
+    parser.parse(ENDPOINT, {"interval_a_averages": {"pos_kwh": 1.0}}, 2025, 4)
+
+    report = parser.parse(
+        ENDPOINT,
+        {
+            "interval_a_averages": {"pos_kwh": 1.0},
+            "interval_a_totals": {"pos_kwh": 30.0},
+        },
+        2025,
+        4,
+    )
+
+    assert report["kwh"] == 30.0
+    assert parser.shape(ENDPOINT) == SHAPE_TOTALS
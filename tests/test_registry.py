@@ -0,0 +1,57 @@
+"""Test the shared EPB API client registry."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.epb.handoff import pop_handoff
+from custom_components.epb.registry import acquire_client, release_client
+
+
+@pytest.fixture
+def hass() -> Mock:
+    """Create a mock Home Assistant instance."""
+    hass = Mock()
+    hass.data = {}
+    with patch("custom_components.epb.registry.aiohttp_client.async_get_clientsession"):
+        yield hass
+
+
+def test_clients_are_shared_per_login(hass: Mock) -> None:
+    """Test users of the same login share one client until all release it."""
+    client = acquire_client(hass, "test@example.com", "password")
+    assert acquire_client(hass, "test@example.com", "password") is client
+    assert acquire_client(hass, "other@example.com", "password") is not client
+
+    release_client(hass, client)
+    assert acquire_client(hass, "test@example.com", "password") is client
+
+    release_client(hass, client)
+    release_client(hass, client)
+    assert acquire_client(hass, "test@example.com", "password") is not client
+
+
+def test_other_password_gets_its_own_client(hass: Mock) -> None:
+    """Test checking a new password does not touch the shared client."""
+    client = acquire_client(hass, "test@example.com", "password")
+    client.restore_session(
+        {"token": "test-token", "expires_at": None, "account_links": []}
+    )
+
+    candidate = acquire_client(hass, "test@example.com", "new-password")
+    release_client(hass, candidate)
+
+    assert candidate is not client
+    assert client.export_session() is not None
+    assert acquire_client(hass, "test@example.com", "password") is client
+
+
+def test_last_release_hands_off_the_session(hass: Mock) -> None:
+    """Test a reloaded entry can reuse the session of the released client."""
+    session = {"token": "test-token", "expires_at": None, "account_links": []}
+    client = acquire_client(hass, "test@example.com", "password")
+    client.restore_session(session)
+
+    release_client(hass, client)
+
+    assert pop_handoff(hass, "test@example.com") == session
@@ -12,7 +12,13 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.epb.api import AccountLink
 from custom_components.epb.const import DOMAIN
 from custom_components.epb.coordinator import EPBUpdateCoordinator
-from custom_components.epb.sensor import EPBCostSensor, EPBEnergySensor
+from custom_components.epb.sensor import (EPBCostChangeSensor, EPBCostSensor,
+                                          EPBDailyRunRateSensor,
+                                          EPBEnergyChangeSensor,
+                                          EPBEnergySensor, EPBPriorCostSensor,
+                                          EPBPriorEnergySensor,
+                                          EPBProjectedCostSensor,
+                                          EPBProjectedEnergySensor)
 
 pytestmark = pytest.mark.asyncio
 
@@ -21,7 +27,21 @@ pytestmark = pytest.mark.asyncio
 def mock_coordinator() -> Mock:
     """Create a mock coordinator."""
     coordinator = Mock(spec=EPBUpdateCoordinator)
-    coordinator.data = {"123": {"kwh": 100.0, "cost": 12.34}}
+    coordinator.data = {
+        "123": {
+            "kwh": 100.0,
+            "cost": 12.34,
+            "daily_run_rate_kwh": 25.0,
+            "daily_run_rate_cost": 3.1,
+            "projected_kwh": 750.0,
+            "projected_cost": 93.0,
+            "prior_kwh": 700.0,
+            "prior_cost": 84.0,
+            "prior_kwh_to_date": 90.0,
+            "kwh_change": 10.0,
+            "cost_change": 1.5,
+        }
+    }
     coordinator.account_links = [
         {
             "power_account": {
@@ -61,6 +81,33 @@ def test_cost_sensor(mock_coordinator: Mock) -> None:
     assert sensor.native_value == 12.34
 
 
+def test_forecast_sensors(mock_coordinator: Mock) -> None:
+    """Test the forecast sensors."""
+    energy = EPBProjectedEnergySensor(mock_coordinator, "123")
+    cost = EPBProjectedCostSensor(mock_coordinator, "123")
+    run_rate = EPBDailyRunRateSensor(mock_coordinator, "123")
+
+    assert energy.unique_id == "epb_projected_energy_123"
+    assert energy.native_value == 750.0
+    assert cost.unique_id == "epb_projected_cost_123"
+    assert cost.native_value == 93.0
+    assert run_rate.unique_id == "epb_daily_run_rate_123"
+    assert run_rate.native_value == 25.0
+    assert run_rate.extra_state_attributes["daily_run_rate_cost"] == 3.1
+
+
+def test_comparison_sensors(mock_coordinator: Mock) -> None:
+    """Test the prior period comparison sensors."""
+    assert EPBPriorEnergySensor(mock_coordinator, "123").native_value == 700.0
+    assert EPBPriorCostSensor(mock_coordinator, "123").native_value == 84.0
+
+    energy_change = EPBEnergyChangeSensor(mock_coordinator, "123")
+    assert energy_change.unique_id == "epb_energy_change_123"
+    assert energy_change.native_value == 10.0
+    assert energy_change.extra_state_attributes["prior_to_date"] == 90.0
+    assert EPBCostChangeSensor(mock_coordinator, "123").native_value == 1.5
+
+
 def test_sensor_unavailable(mock_coordinator: Mock) -> None:
     """Test sensors when data is unavailable."""
     # Simulate no data
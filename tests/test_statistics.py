@@ -0,0 +1,74 @@
+"""Test the import of EPB interval usage as long-term statistics."""
+
+from array import array
+from datetime import timedelta
+from unittest.mock import Mock
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import \
+    statistics_during_period
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import \
+    async_wait_recording_done
+
+from custom_components.epb.const import (CONF_ACCOUNTS, CONF_INTERVAL_USAGE,
+                                         DOMAIN, INTERVAL_BACKFILL_DAYS)
+from custom_components.epb.statistics import statistic_ids
+
+
+async def _hourly_statistics(hass: HomeAssistant) -> dict[str, list]:
+    """Return the imported hourly statistics of account 123."""
+    return await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utcnow() - timedelta(days=INTERVAL_BACKFILL_DAYS + 2),
+        None,
+        set(statistic_ids("123")),
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+
+
+async def test_hourly_statistics_are_imported_once(
+    recorder_mock: Mock,
+    enable_custom_integrations: None,
+    hass: HomeAssistant,
+    mock_epb_api: dict[str, Mock],
+) -> None:
+    """Test backfilled hours are imported and not repeated on refresh."""
+    mock_epb_api["get_interval_usage"].side_effect = None
+    mock_epb_api["get_interval_usage"].return_value = (
+        array("f", [0.25] * 96),
+        array("f", [0.03] * 96),
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "password"},
+        options={CONF_ACCOUNTS: ["123"], CONF_INTERVAL_USAGE: True},
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    energy_id, cost_id = statistic_ids("123")
+    stats = await _hourly_statistics(hass)
+    hours = INTERVAL_BACKFILL_DAYS * 24
+    assert len(stats[energy_id]) == hours
+    assert stats[energy_id][0]["state"] == 1.0
+    assert stats[energy_id][-1]["sum"] == hours
+    assert round(stats[cost_id][-1]["sum"], 2) == round(hours * 0.12, 2)
+
+    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+    await async_wait_recording_done(hass)
+
+    assert len((await _hourly_statistics(hass))[energy_id]) == hours
+    assert hass.states.get("sensor.epb_last_hour_energy_123").state == "1.0"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
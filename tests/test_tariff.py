@@ -0,0 +1,124 @@
+"""Test the EPB local tariff."""
+
+import math
+from array import array
+from datetime import date
+
+import pytest
+import voluptuous as vol
+
+from custom_components.epb.tariff import Tariff
+
+MONDAY = date(2025, 4, 7)
+SATURDAY = date(2025, 4, 12)
+
+TIME_OF_USE = {
+    "type": "time_of_use",
+    "default_rate": 0.1,
+    "periods": [
+        {"start": "22:00", "end": "06:00", "rate": 0.05},
+        {"start": "14:00", "end": "19:00", "rate": 0.2, "weekdays": [0, 1, 2, 3, 4]},
+    ],
+}
+
+
+def test_flat_tariff() -> None:
+    """Test that a flat tariff prices the total usage at one rate."""
+    tariff = Tariff({"type": "flat", "rate": 0.12, "fixed_monthly": 10})
+
+    cost = tariff.bill([(MONDAY, [20.0]), (date(2025, 4, 8), array("f", [0.25] * 96))])
+
+    assert cost == {
+        "kwh": 44.0,
+        "energy_charge": 5.28,
+        "fixed_charge": 10.0,
+        "total": 15.28,
+    }
+
+
+def test_tiered_tariff() -> None:
+    """Test that a tiered tariff prices usage in blocks."""
+    tariff = Tariff(
+        {
+            "type": "tiered",
+            "tiers": [
+                {"up_to": 500, "rate": 0.1},
+                {"up_to": 1000, "rate": 0.12},
+                {"rate": 0.15},
+            ],
+        }
+    )
+
+    assert tariff.bill([(MONDAY, [400.0])])["energy_charge"] == 40.0
+    assert tariff.bill([(MONDAY, [800.0])])["energy_charge"] == 86.0
+    assert (
+        tariff.bill([(MONDAY, [600.0]), (SATURDAY, [600.0])])["energy_charge"] == 140.0
+    )
+
+
+def test_time_of_use_tariff() -> None:
+    """Test that intervals are priced by the period they fall in."""
+    tariff = Tariff(TIME_OF_USE)
+
+    # Five peak hours, eight overnight hours wrapping past midnight and
+    # eleven hours at the default rate
+    assert tariff.bill([(MONDAY, [1.0] * 24)])["energy_charge"] == 2.5
+    # The peak period does not apply at weekends
+    assert tariff.bill([(SATURDAY, [1.0] * 24)])["energy_charge"] == 2.0
+    assert tariff.bill([(MONDAY, [0.25] * 96)])["energy_charge"] == 2.5
+
+
+def test_time_of_use_daily_total() -> None:
+    """Test that a day without intervals is priced at the default rate."""
+    tariff = Tariff(TIME_OF_USE)
+
+    assert tariff.bill([(MONDAY, [24.0])])["energy_charge"] == 2.4
+
+    with pytest.raises(ValueError):
+        tariff.bill([(MONDAY, [1.0] * 48)])
+
+
+def test_missing_intervals_are_skipped() -> None:
+    """Test that intervals not posted yet are left out of the bill."""
+    tariff = Tariff(TIME_OF_USE)
+    readings = array("f", [1.0] * 12 + [math.nan] * 12)
+
+    cost = tariff.bill([(MONDAY, readings)])
+
+    # Six overnight hours and six hours at the default rate
+    assert cost["kwh"] == 12.0
+    assert cost["energy_charge"] == 0.9
+
+
+def test_fixed_charges() -> None:
+    """Test that fixed charges cover the days billed."""
+    tariff = Tariff(
+        {"type": "flat", "rate": 0.1, "fixed_monthly": 5, "fixed_daily": 0.5}
+    )
+
+    cost = tariff.bill([(MONDAY, [10.0]), (SATURDAY, [10.0])])
+
+    assert cost["fixed_charge"] == 6.0
+    assert cost["total"] == 8.0
+    assert tariff.bill([])["total"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"type": "flat"},
+        {"type": "flat", "rate": -0.1},
+        {"type": "tiered", "tiers": []},
+        {"type": "tiered", "tiers": [{"rate": 0.1}, {"up_to": 500, "rate": 0.12}]},
+        {
+            "type": "tiered",
+            "tiers": [{"up_to": 500, "rate": 0.1}, {"up_to": 400, "rate": 0.12}],
+        },
+        {"type": "time_of_use", "periods": [{"start": "25:00", "end": "06:00"}]},
+        {"type": "demand", "rate": 0.1},
+    ],
+)
+def test_invalid_tariff(config: dict) -> None:
+    """Test that invalid tariffs are rejected."""
+    with pytest.raises(vol.Invalid):
+        Tariff(config)
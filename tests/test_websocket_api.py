@@ -0,0 +1,67 @@
+"""Test the EPB websocket API."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+from custom_components.epb.const import DOMAIN
+from custom_components.epb.coordinator import EPBUpdateCoordinator
+from custom_components.epb.history import UsageHistory
+from custom_components.epb.websocket_api import ws_usage_series
+
+
+def _hass_with_history() -> Mock:
+    """Create a mock hass with one loaded entry holding April usage."""
+    hass = Mock()
+    coordinator = EPBUpdateCoordinator(hass, Mock(), timedelta(minutes=15))
+    history = UsageHistory()
+    history.update(
+        [{"date": date(2025, 4, day), "kwh": 1.0, "cost": 0.1} for day in range(1, 31)]
+    )
+    coordinator.history["123"] = history
+    hass.data = {DOMAIN: {"entry": coordinator}}
+    return hass
+
+
+def _call(hass: Mock, **msg: object) -> Mock:
+    """Run the command with a validated message and return the connection."""
+    connection = Mock()
+    ws_usage_series(
+        hass,
+        connection,
+        ws_usage_series._ws_schema({"id": 1, "type": "epb/usage_series", **msg}),
+    )
+    return connection
+
+
+def test_usage_series_pages() -> None:
+    """Test that the cached series is paged."""
+    connection = _call(_hass_with_history(), account_id="123", limit=20)
+
+    result = connection.send_result.call_args[0][1]
+    assert result["total"] == 30
+    assert result["next_offset"] == 20
+    assert len(result["points"]) == 20
+
+    connection = _call(_hass_with_history(), account_id="123", offset=20)
+
+    result = connection.send_result.call_args[0][1]
+    assert result["next_offset"] is None
+    assert result["points"][0]["date"] == "2025-04-21"
+
+
+def test_usage_series_downsampled() -> None:
+    """Test that a long window can be summed per week."""
+    connection = _call(
+        _hass_with_history(), account_id="123", start="2025-04-07", period="week"
+    )
+
+    points = connection.send_result.call_args[0][1]["points"]
+    assert [point["kwh"] for point in points] == [7.0, 7.0, 7.0, 3.0]
+
+
+def test_usage_series_unknown_account() -> None:
+    """Test that an account without history is reported as not found."""
+    connection = _call(_hass_with_history(), account_id="999")
+
+    connection.send_result.assert_not_called()
+    assert connection.send_error.call_args[0][1] == "not_found"